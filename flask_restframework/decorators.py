@@ -18,7 +18,13 @@ def validate(serializerCls):
         return inner
     return dec
 
-def list_route(methods=None):
+def list_route(methods=None, url_path=None):
+    """
+    Adds view function to resource list url: <resource url>/<url_path>
+
+    :param url_path: url part, by default function name is used
+        (it is useful for names which are python keywords, for example "import")
+    """
     methods = methods or ["GET"]
     def dec(func):
 
@@ -28,14 +34,14 @@ def list_route(methods=None):
 
         inner._is_view_function = True
         inner._methods = methods
-        inner._name_part = func.__name__
+        inner._name_part = url_path or func.__name__
         inner._route_part = "/{}".format(inner._name_part)
 
         return inner
 
     return dec
 
-def detail_route(methods=None):
+def detail_route(methods=None, url_path=None):
 
     methods = methods or ["POST"]
 
@@ -47,7 +53,7 @@ def detail_route(methods=None):
 
         inner._is_view_function = True
         inner._methods = methods
-        inner._name_part = func.__name__
+        inner._name_part = url_path or func.__name__
         inner._route_part = "/{}/<pk>".format(inner._name_part)
 
         return inner
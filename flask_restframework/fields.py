@@ -125,6 +125,14 @@ class BaseField(object):
         # TODO: remove all to_python in Field classes
         return self.to_python(value)
 
+    def to_json_many(self, values):
+        """
+        Takes list of python values and returns list of JSON-compatible objects.
+        Is used for serializing batches of items, fields which make queries
+        for each value should override it to make one query for whole batch.
+        """
+        return [self.to_json(value) for value in values]
+
     # TODO: validate MUST be implemented!
     def validate(self, value):
         pass
@@ -135,6 +143,14 @@ class BaseField(object):
 
         return doc.get_field(field)
 
+    def get_model_path(self, field):
+        """
+        Returns model path (with __ notation) which is read by get_value_from_model_object.
+        Used for pushing serializer projection down to queryset.
+        Returns None if field needs whole model instance.
+        """
+        return field
+
 
 
 class StringField(BaseField):
@@ -273,6 +289,9 @@ class MethodField(BaseField):
         assert isinstance(doc, InstanceWrapper)
         return getattr(self.serializer, self.methodName)(doc.item)
 
+    def get_model_path(self, field):
+        return None
+
     def to_python(self, value):
         return value
 
@@ -298,6 +317,9 @@ class BaseRelatedField(BaseField):
         assert isinstance(doc, InstanceWrapper)
         return doc.get_field(self.document_fieldname or field)
 
+    def get_model_path(self, field):
+        return self.document_fieldname or field
+
 class ForeignKeyField(BaseRelatedField):
     """
     Fields represent ForeignKeyRelation which can be getted with __ notation.
@@ -340,13 +362,22 @@ class ReferenceField(BaseField):
         self.nested_serializer = serializer
         self.queryset = queryset
 
-    def to_json(self, value):
+    def _get_pk(self, value):
         if isinstance(value, DBRef):
-            pk = value.id
+            return value.id
         elif isinstance(value, InstanceWrapper):
-            pk = value.get_id()
-        else:
-            pk = value
+            return value.get_id()
+        elif isinstance(value, db.Document):
+            return value.pk
+        return value
+
+    def get_value_from_model_object(self, doc, field):
+        # referenced objects are resolved for whole batch in to_json_many,
+        # so reference isn't dereferenced for each document
+        return doc.get_raw_field(field)
+
+    def to_json(self, value):
+        pk = self._get_pk(value)
 
         return self.nested_serializer(
             self.queryset.filter_by(
@@ -354,6 +385,26 @@ class ReferenceField(BaseField):
             )
         ).serialize()[0]
 
+    def to_json_many(self, values):
+        "Resolves all referenced objects with one id__in query"
+        pks = [self._get_pk(value) for value in values]
+
+        wanted = set(pk for pk in pks if pk is not None)
+        resolved = {}
+
+        if wanted:
+            qs = self.queryset.filter_by(id__in=list(wanted))
+            items = list(qs.get_data())
+
+            serialized = self.nested_serializer(qs)._serialize_items(items)
+            for item, data in zip(items, serialized):
+                resolved[str(item.get_id())] = data
+
+        return [
+            resolved.get(str(pk)) if pk is not None else None
+            for pk in pks
+        ]
+
 
 
 class PrimaryKeyRelatedField(BaseRelatedField):
@@ -413,10 +464,30 @@ class ListField(BaseField):
         super(ListField, self).__init__(**k)
         self.inner_serializer = innerField  # type: BaseField
 
+    def get_value_from_model_object(self, doc, field):
+        if isinstance(self.inner_serializer, ReferenceField):
+            return self.inner_serializer.get_value_from_model_object(doc, field)
+
+        return super(ListField, self).get_value_from_model_object(doc, field)
+
     def to_json(self, value):
         if value:
             return list(map(self.inner_serializer.to_json, value))
 
+    def to_json_many(self, values):
+        "Encodes all inner values of batch together"
+        flat = []
+        for value in values:
+            if value:
+                flat.extend(value)
+
+        encoded = iter(self.inner_serializer.to_json_many(flat))
+
+        return [
+            [next(encoded) for _ in value] if value else None
+            for value in values
+        ]
+
     def validate(self, value):
         if not isinstance(value, list):
             raise ValidationError("Array is required")
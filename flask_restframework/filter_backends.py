@@ -71,7 +71,9 @@ class JsonFilterBackend(BaseBackend):
 
     .. warning::
 
-        This filter can be used only with :class:`.MongoDbQuerySet`
+        This filter can be used only with MongoDB querysets (:class:`.MongoDbQuerySet`,
+        :class:`.CursorQuerySet` and :class:`.CachedQuerySet` of them),
+        see :meth:`.QuerysetWrapper.filter_raw`
 
     """
     qs = None   #type: MongoDbQuerySet
@@ -83,12 +85,10 @@ class JsonFilterBackend(BaseBackend):
         except:
             return self.qs
 
-        assert isinstance(self.qs, MongoDbQuerySet)
-
         if hasattr(self.resource, "update_json_filter"):
             json_filter = self.resource.__class__.update_json_filter(json_filter)
 
-        self.qs = MongoDbQuerySet.from_queryset(self.qs.data.filter(__raw__=json_filter))
+        self.qs = self.qs.filter_raw(json_filter)
 
         return self.qs
 
@@ -6,8 +6,15 @@ To enable middlewares support you should register, for example::
 
 """
 from flask import globals as g
+from flask.globals import current_app
 from flask.wrappers import Response
 
+from flask_restframework.utils import unit_of_work
+from flask_restframework.utils.cache import LRUCache, get_generation, bump_generation
+
+#: responses cache used by ResponseCacheMiddleware if FLASK_REST["RESPONSE_CACHE"] isn't set
+default_response_cache = LRUCache(max_size=1000, max_bytes=64 * 1024 * 1024)
+
 
 class BaseMiddleware(object):
 
@@ -94,3 +101,166 @@ class CorsMiddleware(BaseMiddleware):
 
         return response
 
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """
+    Commits all SQLAlchemy changes made during request (including after_create/after_update hooks)
+    with one commit at the end of request. Changes are rolled back if response status is 4xx/5xx
+    or request fails with exception. See :mod:`flask_restframework.utils.unit_of_work`.
+
+    Engine pool settings can be passed with config (they are applied if SQLALCHEMY_* keys aren't set)::
+
+        FLASK_REST = {
+            "SQLALCHEMY_POOL": {
+                "pool_size": 10,
+                "max_overflow": 20,
+                "pool_timeout": 30,
+                "pool_recycle": 3600
+            }
+        }
+
+    Middleware should be registered before first database query, because engine is created on it.
+    """
+
+    POOL_CONFIG = {
+        "pool_size": "SQLALCHEMY_POOL_SIZE",
+        "max_overflow": "SQLALCHEMY_MAX_OVERFLOW",
+        "pool_timeout": "SQLALCHEMY_POOL_TIMEOUT",
+        "pool_recycle": "SQLALCHEMY_POOL_RECYCLE",
+    }
+
+    def configure_pool(self):
+        pool = self.app.config.get("FLASK_REST", {}).get("SQLALCHEMY_POOL", {})
+
+        unknown = set(pool) - set(self.POOL_CONFIG)
+        if unknown:
+            raise ValueError("Unknown SQLALCHEMY_POOL settings: {}, allowed: {}".format(
+                ", ".join(sorted(unknown)), ", ".join(sorted(self.POOL_CONFIG))
+            ))
+
+        for key, value in pool.items():
+            configKey = self.POOL_CONFIG[key]
+            if self.app.config.get(configKey) is None:
+                self.app.config[configKey] = value
+
+    def before_request(self):
+        unit_of_work.begin()
+
+    def after_request(self, response):
+        unit_of_work.end(commit=response.status_code < 400)
+        return response
+
+    def teardown_request(self, exc):
+        # after_request isn't called on unhandled exceptions
+        unit_of_work.end(commit=False)
+
+    def register_handlers(self):
+        self.configure_pool()
+        super(UnitOfWorkMiddleware, self).register_handlers()
+        self.app.teardown_request(self.teardown_request)
+
+
+class ResponseCacheMiddleware(BaseMiddleware):
+    """
+    Caches GET responses of resources which set response_cache_ttl attribute::
+
+        class SomeResource(ModelResource):
+            response_cache_ttl = 60
+            response_cache_vary_headers = ["Authorization"]
+            response_cache_vary_args = ["page", "page_size"]
+
+    Cache key consists of endpoint, path, query args (response_cache_vary_args, all by default)
+    and values of response_cache_vary_headers (Authorization and Cookie by default, so responses
+    of one user aren't returned to another). Hits are returned from before_request
+    without dispatching and serialization. Only 200 responses without cookies are cached,
+    streamed responses aren't cached.
+
+    Write endpoints of model mixins invalidate all cached responses of resource
+    (see :meth:`flask_restframework.model_resource.GenericResource.invalidate_cache`).
+
+    By default in-process LRU cache is used, other :class:`flask_restframework.utils.cache.BaseCache`
+    can be set by config::
+
+        FLASK_REST = {
+            "RESPONSE_CACHE": RedisCache()
+        }
+
+    Before hit is returned, request is authenticated with authentication backends of view
+    (like :class:`AuthenticationMiddleware` does), if it isn't authenticated yet,
+    so hits aren't returned to not authenticated requests regardless of order of middlewares.
+    """
+
+    _KEY = "_rest_response_cache_key"
+
+    @classmethod
+    def get_cache(cls, app=None):
+        app = app or current_app
+        return app.config.get("FLASK_REST", {}).get("RESPONSE_CACHE", default_response_cache)
+
+    @classmethod
+    def _get_name(cls, resourceCls):
+        return "response:{}.{}".format(resourceCls.__module__, resourceCls.__name__)
+
+    @classmethod
+    def invalidate(cls, resourceCls):
+        "Invalidates all cached responses of resourceCls"
+        bump_generation(cls.get_cache(), cls._get_name(resourceCls))
+
+    def get_resource_class(self):
+        "Returns resource class which will process current request or None"
+        return getattr(self.get_view(), "resource_class", None)
+
+    def get_key(self, resourceCls):
+        request = g.request
+        cache = self.get_cache(self.app)
+        name = self._get_name(resourceCls)
+
+        args = sorted(
+            (key, value)
+            for key, value in request.args.items(multi=True)
+            if resourceCls.response_cache_vary_args is None or key in resourceCls.response_cache_vary_args
+        )
+        headers = [request.headers.get(key) for key in resourceCls.response_cache_vary_headers]
+
+        return "{}:{}:{}:{}:{}:{}".format(
+            name, get_generation(cache, name), request.url_rule.endpoint, request.path, args, headers
+        )
+
+    def before_request(self):
+        if g.request.method != "GET":
+            return None
+
+        resourceCls = self.get_resource_class()
+        if resourceCls is None or resourceCls.response_cache_ttl is None:
+            return None
+
+        key = self.get_key(resourceCls)
+        cached = self.get_cache(self.app).get(key)
+
+        if cached is None:
+            # response is saved in after_request
+            setattr(g.request, self._KEY, (key, resourceCls.response_cache_ttl))
+            return None
+
+        if getattr(g.request, "user", None) is None:
+            response = AuthenticationMiddleware(self.app).before_request()
+            if response is not None:
+                return response
+
+        status, headers, data = cached
+        response = Response(data, status=status, headers=headers)
+        return response.make_conditional(g.request)
+
+    def after_request(self, response):
+        #type: (Response)->Response
+        key = getattr(g.request, self._KEY, None)
+        if key is None:
+            return response
+
+        key, ttl = key
+        if response.status_code == 200 and not response.is_streamed and "Set-Cookie" not in response.headers:
+            self.get_cache(self.app).set(
+                key, (response.status_code, list(response.headers.items()), response.get_data()), ttl=ttl
+            )
+
+        return response
@@ -1,7 +1,41 @@
+from flask import jsonify
+from flask.globals import current_app
+
 
 class DeleteManyMixin:
+    """
+    Allows to delete many objects of resource queryset::
+
+        DELETE <resource base url>
+        {"ids": ["<id1>", "<id2>"]}
+
+    If ids aren't passed, all objects of queryset are deleted.
+
+    Objects are deleted by chunks of delete_chunk_size ids (see
+    :meth:`flask_restframework.queryset_wrapper.QuerysetWrapper.bulk_delete`), so big deletes
+    don't lock collection/table for a long time. Response contains count of deleted objects
+    and count of processed chunks::
+
+        {"deleted": 2500, "chunks": 3}
+    """
 
     _allowed_methods = ["delete"]
+    delete_chunk_size = None    #count of ids deleted with one query
+
+    def get_delete_chunk_size(self):
+        """
+        Returns count of ids deleted with one query
+
+        You can use delete_chunk_size attribute or set config variable:
+
+            FLASK_REST = {
+                "DELETE_CHUNK_SIZE": 1000
+            }
+        """
+        if self.delete_chunk_size is not None:
+            return self.delete_chunk_size
+
+        return current_app.config.get("FLASK_REST", {}).get("DELETE_CHUNK_SIZE", 1000)
 
     def delete(self, request):
         ids = None
@@ -9,11 +43,32 @@ class DeleteManyMixin:
         if request.json:
             ids = request.json.get("ids")
 
-        qs = self.get_queryset()
+        qs = self.get_adaptated_queryset()
 
         if ids:
-            qs = qs.filter(id__in=ids)
+            qs = qs.filter_by(id__in=ids)
+
+        size = self.get_delete_chunk_size()
+        deleted = 0
+        chunks = 0
+
+        # rows inserted concurrently into queryset can make loop endless, so count of chunks
+        # is limited by count of rows at the start (and one more chunk for the rest)
+        total = len(ids) if ids else qs.count()
+        max_chunks = total // size + 2
+
+        while chunks < max_chunks:
+            chunk = [item.get_id() for item in qs.only("id").slice(0, size).get_data()]
+            if not chunk:
+                break
+
+            count = qs.bulk_delete(chunk)
+            if not count:
+                # rows of chunk can't be deleted, the same chunk would be fetched again
+                break
 
-        qs.delete()
+            deleted += count
+            chunks += 1
+            self.invalidate_cache(chunk)
 
-        return "{}"
\ No newline at end of file
+        return jsonify({"deleted": deleted, "chunks": chunks})
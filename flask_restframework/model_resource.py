@@ -1,17 +1,39 @@
 import copy
+import datetime
+import functools
+import hashlib
+import threading
 
 import six
 from flask import jsonify
 from flask.globals import current_app
-from flask.wrappers import Request
+from flask.helpers import stream_with_context
+from flask.wrappers import Request, Response
 from mongoengine.errors import DoesNotExist
+from werkzeug.http import is_resource_modified
 
-from flask_restframework.queryset_wrapper import QuerysetWrapper, InstanceWrapper
+from flask_restframework.queryset_wrapper import QuerysetWrapper, InstanceWrapper, LazyInstanceWrapper, \
+    SnapshotInstanceWrapper, CachedQuerySet
 from flask_restframework.serializer.base_serializer import BaseSerializer
-from flask_restframework.exceptions import NotFound
+from flask_restframework.exceptions import NotFound, ValidationError
+from flask_restframework.decorators import list_route
 from flask_restframework.filter_backends import BaseBackend
 from flask_restframework.resource import BaseResource, BaseResourceMetaClass
 from flask_restframework.serializer.model_serializer import ModelSerializer
+from flask_restframework.utils import unit_of_work
+from flask_restframework.utils.cache import LRUCache, get_generation, bump_generation
+from flask_restframework.utils.singleflight import SingleFlight
+from flask_restframework.utils.util import iter_json_array, is_method_overridden
+
+#: query results cache shared between resources, see GenericResource.get_query_cache
+default_query_cache = LRUCache(max_size=10000, max_bytes=64 * 1024 * 1024)
+
+_detail_caches = {}     #resource class: default detail cache of resource
+_detail_caches_lock = threading.Lock()
+
+_MISSING = object()
+
+_list_flight = SingleFlight()   #coalesced list requests, see ListObjectsMixin.is_coalesce_requests
 
 
 class GenericResource(BaseResource):
@@ -21,6 +43,18 @@ class GenericResource(BaseResource):
     queryset = None
     pagination_class = None
     filter_backends = None  #list of BaseBackend subclasses for filtering GET output
+    stream_list = None      #if True, list responses are streamed item by item
+    use_projection = False  #if True, only fields needed by serializer_class are loaded on GET
+    raw_list = None         #if True, list endpoint fetches raw records (see QuerysetWrapper.as_raw)
+    bulk_max_size = None    #max count of objects in one bulk request
+    query_cache_ttl = None  #seconds to cache query results for, if None results aren't cached
+    query_cache = None      #BaseCache instance for query results
+    detail_cache_ttl = None     #seconds to cache serialized objects of detail GET for, if None they aren't cached
+    detail_cache_not_found_ttl = None   #seconds to cache 404 of detail GET for, detail_cache_ttl by default
+    detail_cache_size = 1000    #max count of objects in default detail cache of resource
+    detail_cache = None     #BaseCache instance for serialized objects of detail GET
+    etag_field = None       #model field which is changed on each update (version or updated at) for cheap ETags
+    use_etag = None         #if True, GET responses have ETag and conditional requests are answered with 304
 
     def __init__(self, request):
         super(GenericResource, self).__init__(request)
@@ -44,6 +78,38 @@ class GenericResource(BaseResource):
 
         return self.pagination_class or current_app.config.get("FLASK_REST", {}).get("PAGINATION_CLASS")
 
+    def is_stream_list(self):
+        """
+        Returns True if list responses should be streamed (chunked JSON array
+        which is written while items are serialized).
+
+        You can use stream_list attribute or set config variable:
+
+            FLASK_REST = {
+                "STREAM_LIST": True
+            }
+        """
+        if self.stream_list is not None:
+            return self.stream_list
+
+        return current_app.config.get("FLASK_REST", {}).get("STREAM_LIST", False)
+
+    def is_raw_list(self):
+        """
+        Returns True if list endpoint should fetch raw records, without model instances construction.
+
+        You can use raw_list attribute of resource or serializer_class Meta::
+
+            class Meta:
+                model = SomeDocument
+                raw_list = True
+        """
+        if self.raw_list is not None:
+            return self.raw_list
+
+        meta = getattr(self.serializer_class, "Meta", None)
+        return getattr(meta, "raw_list", False)
+
     def get_queryset(self):
         return self.queryset
 
@@ -52,17 +118,294 @@ class GenericResource(BaseResource):
         qs = self.get_queryset()
 
         if not isinstance(qs, QuerysetWrapper):
-            return QuerysetWrapper.from_queryset(qs)
+            qs = QuerysetWrapper.from_queryset(qs)
+
+        ttl = self.get_query_cache_ttl()
+        if ttl is not None and not isinstance(qs, CachedQuerySet):
+            qs = CachedQuerySet(qs, self.get_query_cache(), ttl)
+
+        return qs
+
+    def get_query_cache_ttl(self):
+        """
+        Returns count of seconds for which query results are cached
+        (see :class:`flask_restframework.queryset_wrapper.CachedQuerySet`) or None if they aren't cached.
+
+        You can use query_cache_ttl attribute or set config variable:
+
+            FLASK_REST = {
+                "QUERY_CACHE_TTL": 60
+            }
+        """
+        if self.query_cache_ttl is not None:
+            return self.query_cache_ttl
+
+        return current_app.config.get("FLASK_REST", {}).get("QUERY_CACHE_TTL")
+
+    def get_query_cache(self):
+        """
+        Returns cache for query results. By default in-process LRU cache is used,
+        you can set query_cache attribute or config variable to other
+        :class:`flask_restframework.utils.cache.BaseCache` implementation:
+
+            FLASK_REST = {
+                "QUERY_CACHE": RedisCache()
+            }
+        """
+        if self.query_cache is not None:
+            return self.query_cache
+
+        return current_app.config.get("FLASK_REST", {}).get("QUERY_CACHE", default_query_cache)
+
+    def is_etag_enabled(self):
+        """
+        Returns True if GET responses should have ETag and conditional requests
+        (If-None-Match, If-Modified-Since) should be answered with 304.
+
+        If etag_field is set, ETag is computed from its values before serialization
+        (Last-Modified is set for detail responses if it is datetime in UTC),
+        else ETag is hash of serialized response body.
+
+        You can use use_etag attribute (it is True by default if etag_field is set)
+        or set config variable:
+
+            FLASK_REST = {
+                "USE_ETAG": True
+            }
+        """
+        if self.use_etag is not None:
+            return self.use_etag
+
+        if self.etag_field:
+            return True
+
+        return current_app.config.get("FLASK_REST", {}).get("USE_ETAG", False)
+
+    def get_version_etag(self, *parts):
+        "Returns ETag for parts of resource version (for example pk and etag_field value)"
+        key = ":".join(six.text_type(part) for part in parts)
+        return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+    def check_not_modified(self, request, etag, last_modified=None):
+        """
+        Returns 304 response if client already has this version of resource
+        (by If-None-Match or If-Modified-Since headers) or None
+        """
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            return None
+
+        return self.set_validators(Response(status=304), etag, last_modified)
+
+    def set_validators(self, response, etag, last_modified=None):
+        "Sets ETag and Last-Modified headers of response"
+        response.set_etag(etag)
+
+        if last_modified is not None:
+            response.last_modified = last_modified
+
+        return response
+
+    def make_conditional(self, response, request):
+        """
+        Sets ETag of response by hash of its body and turns it to 304
+        if client already has the same body
+        """
+        if response.status_code == 200 and not response.is_streamed:
+            response.add_etag()
+            response.make_conditional(request)
+
+        return response
+
+    def get_detail_cache_ttl(self):
+        """
+        Returns count of seconds for which serialized objects of detail GET are cached
+        or None if they aren't cached.
+
+        Enable it only for resources which querysets and serializers don't depend on request
+        (for example on current user), because objects are cached by pk only.
+
+        You can use detail_cache_ttl attribute or set config variable:
+
+            FLASK_REST = {
+                "DETAIL_CACHE_TTL": 60
+            }
+        """
+        if self.detail_cache_ttl is not None:
+            return self.detail_cache_ttl
+
+        return current_app.config.get("FLASK_REST", {}).get("DETAIL_CACHE_TTL")
+
+    def get_detail_cache(self):
+        """
+        Returns cache for serialized objects of detail GET.
+        By default each resource has own in-process LRU cache of detail_cache_size objects,
+        you can set detail_cache attribute to other :class:`flask_restframework.utils.cache.BaseCache`
+        """
+        if self.detail_cache is not None:
+            return self.detail_cache
+
+        cls = self.__class__
+        cache = _detail_caches.get(cls)
+
+        if cache is None:
+            with _detail_caches_lock:
+                cache = _detail_caches.get(cls)
+                if cache is None:
+                    cache = _detail_caches[cls] = LRUCache(max_size=self.detail_cache_size)
+
+        return cache
+
+    def _get_detail_cache_name(self):
+        return "detail:{}.{}".format(self.__class__.__module__, self.__class__.__name__)
+
+    def _get_detail_cache_key(self, pk):
+        cache = self.get_detail_cache()
+        name = self._get_detail_cache_name()
+        return "{}:{}:{}".format(name, get_generation(cache, name), pk)
+
+    def invalidate_cache(self, pks=None):
+        """
+        Invalidates cached query results of resource model, cached responses of resource
+        and cached detail objects of resource with passed pks (all objects if pks is None).
+        Is called by write endpoints, call it if you change model data in other way.
+
+        If unit of work is active (see :class:`flask_restframework.middlewares.UnitOfWorkMiddleware`),
+        caches are invalidated again after commit, so data read by concurrent requests
+        before commit isn't served from cache.
+        """
+        self._invalidate_cache(pks)
+
+        if unit_of_work.is_active():
+            unit_of_work.on_commit(functools.partial(self._invalidate_cache, pks))
+
+    def _invalidate_cache(self, pks):
+        qs = self.get_queryset()
+        if not isinstance(qs, QuerysetWrapper):
+            qs = QuerysetWrapper.from_queryset(qs)
+
+        model = qs.get_model_key()
+        if model is not None:
+            bump_generation(self.get_query_cache(), model)
+
+        self.invalidate_response_cache()
+
+        if self.get_detail_cache_ttl() is not None:
+            cache = self.get_detail_cache()
+
+            if pks is None:
+                bump_generation(cache, self._get_detail_cache_name())
+            else:
+                for pk in pks:
+                    cache.delete(self._get_detail_cache_key(pk))
+
+    def get_projection(self):
+        """
+        Returns list of model paths which are needed by serializer_class
+        or None if whole instances should be loaded.
+        """
+        if not self.use_projection:
+            return None
+
+        return self.serializer_class.get_model_paths()
+
+    def project_qs(self, qs):
+        # type: (QuerysetWrapper)->QuerysetWrapper
+        """
+        Pushes projection of serializer_class fields down to queryset.
+        Fields of queryset ordering are loaded too (they are needed for keyset pagination)
+        """
+        paths = self.get_projection()
+
+        if paths:
+            qs = qs.only(*(list(paths) + [field.lstrip("-") for field in qs.ordering]))
+
         return qs
 
-    def get_instance(self, pk):
+    def get_instance(self, pk, only=None):
         # type: ()->InstanceWrapper
-        "returns one instance from queryset by its PK"
+        """
+        returns one instance from queryset by its PK
+
+        :param only: optional list of model paths which should be loaded
+        """
+        qs = self.get_adaptated_queryset()
+
+        if only:
+            qs = qs.only(*only)
+
         try:
-            return self.get_adaptated_queryset().get(id=pk)
+            return qs.get(id=pk)
         except DoesNotExist:
             raise NotFound("Object not found")
 
+    def get_bulk_max_size(self):
+        """
+        Returns max count of objects which can be passed to bulk endpoints
+
+        You can use bulk_max_size attribute or set config variable:
+
+            FLASK_REST = {
+                "BULK_MAX_SIZE": 1000
+            }
+        """
+        if self.bulk_max_size is not None:
+            return self.bulk_max_size
+
+        return current_app.config.get("FLASK_REST", {}).get("BULK_MAX_SIZE", 1000)
+
+    def validate_many(self, items, part=False, instances=None):
+        #type: (list[dict], bool, list[InstanceWrapper])->tuple
+        """
+        Validates list of objects with serializer_class.
+        Returns pair (serializers, errors), where errors is dict {item index: serializer errors}
+
+        :param instances: optional list of updated instances in the same order as items
+        """
+        if not isinstance(items, list):
+            raise ValidationError("List of objects expected")
+
+        if len(items) > self.get_bulk_max_size():
+            raise ValidationError("Too many objects, max {}".format(self.get_bulk_max_size()))
+
+        serializers = []
+        errors = {}
+
+        for index, item in enumerate(items):
+            context = {}
+            if instances is not None:
+                context["instance"] = instances[index]
+
+            serializer = self.serializer_class(item, context=context)
+            if not serializer.validate(part=part):
+                errors[str(index)] = serializer.errors
+
+            serializers.append(serializer)
+
+        return serializers, errors
+
+    def get_instances(self, pks, only=None, prefetch=None):
+        # type: (list, list, list)->list[InstanceWrapper]
+        """
+        Returns instances for list of pks with one query.
+        Result is in the same order as pks, None for not found pks.
+
+        :param only: optional list of model paths which should be loaded
+        :param prefetch: optional list of relation paths for prefetch_related
+        """
+        qs = self.get_adaptated_queryset()
+
+        if only:
+            qs = qs.only(*only)
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+
+        found = dict(
+            (str(instance.get_id()), instance)
+            for instance in qs.filter_by(id__in=list(pks)).get_data()
+        )
+
+        return [found.get(str(pk)) for pk in pks]
+
     def get_backend_classes(self):
         "Returns backend classes"
 
@@ -86,6 +429,11 @@ class GenericResource(BaseResource):
         return request.json
 
 
+def _freeze_response(response):
+    "Returns (status, headers, body) of response, which can be shared between requests"
+    return response.status_code, list(response.headers.items()), response.get_data()
+
+
 class ListObjectsMixin:
     """
     Allows you to add GET endpoint for resource:
@@ -93,29 +441,164 @@ class ListObjectsMixin:
         GET /yourresource
 
     Returns array of (paginated if set pagination_class) elements
+
+    Many objects can be fetched by ids with one query::
+
+        GET /yourresource?_ids=<id1>,<id2>
+        POST /yourresource/batch_get
+        {"ids": ["<id1>", "<id2>"]}
+
+    Response is ``{"results": [...], "missing": [...]}``, results are in order of passed ids,
+    null for not found objects, which are listed in missing. Query argument starts with underscore,
+    so it doesn't conflict with filter fields and isn't used by filter backends.
+
+    If coalesce_requests is set (see :meth:`is_coalesce_requests`), identical concurrent
+    list requests of worker threads are coalesced: one request queries database and
+    builds response, the others wait for it and get copy of its response.
     """
+    coalesce_requests = None
+    #: request headers which are part of coalescing key (if response depends on them)
+    coalesce_vary_headers = ("Authorization", "Cookie", "If-None-Match", "If-Modified-Since")
+
+    def is_coalesce_requests(self):
+        """
+        Returns True if identical concurrent list requests should be coalesced.
+
+        You can use coalesce_requests attribute or set config variable:
+
+            FLASK_REST = {
+                "COALESCE_REQUESTS": True
+            }
+        """
+        if self.coalesce_requests is not None:
+            return self.coalesce_requests
+
+        return current_app.config.get("FLASK_REST", {}).get("COALESCE_REQUESTS", False)
+
     def get(self, request):
         assert isinstance(self, ModelResource)
 
+        ids = request.args.get("_ids")
+        if ids:
+            return self._get_many(ids.split(","))
+
+        if self.is_coalesce_requests() and not self.is_stream_list():
+            status, headers, data = _list_flight.do(
+                self._get_coalesce_key(request), lambda: _freeze_response(self._get_list(request))
+            )
+            return Response(data, status=status, headers=headers)
+
+        return self._get_list(request)
+
+    def _get_coalesce_key(self, request):
+        "Returns key of request: endpoint, path, url params, normalized query args and coalesce_vary_headers"
+        return (
+            request.url_rule.endpoint,
+            request.path,
+            tuple(sorted((request.view_args or {}).items())),
+            tuple(sorted(request.args.items(multi=True))),
+            tuple(request.headers.get(key) for key in self.coalesce_vary_headers),
+        )
+
+    def _get_list(self, request):
         qs = self.get_adaptated_queryset()
 
         qs = self.filter_qs(qs)
 
         assert isinstance(qs, QuerysetWrapper)
 
+        qs = self.project_qs(qs)
+
+        if self.is_raw_list():
+            qs = qs.as_raw()
+
         paginationCls = self.get_pagination_class()
 
+        pagination = None
         if paginationCls:
             pagination = paginationCls(qs)
             pagination.paginate(request)
+            qs = pagination.qs
 
-            data = self.serializer_class(pagination.qs).serialize()
+        etag = None
+        if self.etag_field and self.is_etag_enabled():
+            etag = self._get_list_etag(qs, pagination)
 
-            data = pagination.update_response(data)
+            response = self.check_not_modified(request, etag)
+            if response is not None:
+                return response
+
+        serializer = self.serializer_class(qs)
+
+        if pagination:
+            if self.is_stream_list():
+                response = self._stream_list(serializer, pagination.update_response)
+            else:
+                data = serializer.serialize()
+                response = jsonify(pagination.update_response(data))
         else:
-            data = self.serializer_class(qs).serialize()
+            if self.is_stream_list():
+                response = self._stream_list(serializer)
+            else:
+                response = jsonify(serializer.serialize())
+
+        if etag is not None:
+            return self.set_validators(response, etag)
+        elif self.is_etag_enabled():
+            return self.make_conditional(response, request)
+
+        return response
+
+    def _get_list_etag(self, qs, pagination=None):
+        """
+        Returns ETag of list (page) by pk and etag_field values of all its objects
+        (only these fields are loaded) and total count of pagination.
+        Last-Modified isn't used for lists, because it doesn't change when objects are deleted.
+        """
+        field = self.etag_field
 
-        return jsonify(data)
+        parts = [getattr(pagination, "total", None)]
+        for item in qs.only("id", field).get_data():
+            parts.append(item.get_id())
+            parts.append(item.get_field(field))
+
+        return self.get_version_etag(*parts)
+
+    @list_route(methods=["POST"])
+    def batch_get(self, request):
+        data = self.get_data(request)
+        ids = data.get("ids") if isinstance(data, dict) else None
+
+        if not isinstance(ids, list):
+            raise ValidationError({"ids": ["List of ids expected"]})
+
+        return self._get_many(ids)
+
+    def _get_many(self, pks):
+        if len(pks) > self.get_bulk_max_size():
+            raise ValidationError({"ids": ["Too many ids, max {}".format(self.get_bulk_max_size())]})
+
+        instances = self.get_instances(
+            pks, only=self.get_projection(), prefetch=self.serializer_class.get_prefetch_paths()
+        )
+
+        found = [instance for instance in instances if instance is not None]
+        serialized = iter(self.serializer_class(found)._serialize_items(found))
+
+        return jsonify({
+            "results": [
+                next(serialized) if instance is not None else None
+                for instance in instances
+            ],
+            "missing": [pk for pk, instance in zip(pks, instances) if instance is None]
+        })
+
+    def _stream_list(self, serializer, wrap=None):
+        "Returns chunked response, which writes JSON array items as they are serialized"
+        return Response(
+            stream_with_context(iter_json_array(serializer.iter_serialize(), wrap=wrap)),
+            mimetype="application/json"
+        )
 
 
 class CreateMixin:
@@ -126,6 +609,9 @@ class CreateMixin:
     def post(self, request):
         data = self.get_data(request)
 
+        if isinstance(data, list):
+            return self._perform_bulk_create(data)
+
         serializer = self.serializer_class(data)
 
         if not serializer.validate():
@@ -135,30 +621,135 @@ class CreateMixin:
 
         instance = serializer.create(serializer.cleaned_data)
         assert isinstance(instance, InstanceWrapper)
+        self.invalidate_cache([instance.get_id()])
 
         self.after_create(instance, serializer.cleaned_data)
 
         return jsonify(self.serializer_class(instance).serialize())
 
+    def _perform_bulk_create(self, data):
+        "Validates all passed objects and creates them in one round trip"
+        serializers, errors = self.validate_many(data)
+
+        if errors:
+            out = jsonify(errors)
+            out.status_code = 400
+            return out
+
+        if not serializers:
+            return jsonify([])
+
+        instances = serializers[0].bulk_create([s.cleaned_data for s in serializers])
+        self.invalidate_cache([instance.get_id() for instance in instances])
+
+        for instance, serializer in zip(instances, serializers):
+            self.after_create(instance, serializer.cleaned_data)
+
+        return jsonify([
+            self.serializer_class(instance).serialize()
+            for instance in instances
+        ])
+
 
 class RetrieveMixin:
+    """
+    Allows you to add GET endpoint for one object::
+
+        GET /yourresource/<pk>
+
+    If detail_cache_ttl is set (see :meth:`GenericResource.get_detail_cache_ttl`), serialized
+    objects are cached by pk, 404 responses are cached for detail_cache_not_found_ttl seconds.
+    Write endpoints of resource invalidate cached objects.
+
+    If etag_field is set and objects aren't cached, only etag_field is loaded
+    for conditional requests and 304 is answered without serialization
+    (see :meth:`GenericResource.is_etag_enabled`).
+    """
     def get_object(self, request, pk):
         assert isinstance(self, GenericResource)
-        obj = self.get_instance(pk) #type: InstanceWrapper
+
+        if not self.is_etag_enabled():
+            return jsonify(self._get_object_data(pk))
+
+        if not self.etag_field or self.get_detail_cache_ttl() is not None:
+            # cached object is cheaper than version query
+            return self.make_conditional(jsonify(self._get_object_data(pk)), request)
+
+        version = self.get_instance(pk, only=["id", self.etag_field]).get_field(self.etag_field)
+        etag = self.get_version_etag(pk, version)
+        last_modified = version if isinstance(version, datetime.datetime) else None
+
+        response = self.check_not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        return self.set_validators(jsonify(self._get_object_data(pk)), etag, last_modified)
+
+    def _get_object_data(self, pk):
+        "Returns serialized object (from detail cache if it is enabled)"
+        ttl = self.get_detail_cache_ttl()
+        if ttl is None:
+            return self._serialize_object(pk)
+
+        cache = self.get_detail_cache()
+        key = self._get_detail_cache_key(pk)
+
+        data = cache.get(key, _MISSING)
+        if data is _MISSING:
+            try:
+                data = self._serialize_object(pk)
+            except NotFound:
+                data = None
+
+            if data is None:
+                not_found_ttl = self.detail_cache_not_found_ttl
+                cache.set(key, None, ttl=ttl if not_found_ttl is None else not_found_ttl)
+            else:
+                cache.set(key, data, ttl=ttl)
+
+        if data is None:
+            raise NotFound("Object not found")
+
+        return data
+
+    def _serialize_object(self, pk):
+        obj = self.get_instance(pk, only=self.get_projection()) #type: InstanceWrapper
         assert isinstance(obj, InstanceWrapper)
 
-        return jsonify(self.serializer_class(obj).serialize())
+        return self.serializer_class(obj).serialize()
 
 
 class UpdateMixin:
+    #: if True, PATCH is done by one atomic update query (see QuerysetWrapper.update_one)
+    #: without loading instance. By default it is used if neither after_update and get_instance
+    #: of resource nor update of serializer_class is overridden
+    atomic_update = None
+    #: if True, after_update gets deep copy of instance made before update,
+    #: else cheap snapshot (see SnapshotInstanceWrapper) with old values of changed fields,
+    #: its item is copy of instance with old values, which is built on first access
+    deepcopy_old_instance = False
+
     def after_update(self, oldInstance, updatedInstance, validated_data):
         "Will be called after updating existed instance"
         pass
 
+    def is_atomic_update(self):
+        if self.atomic_update is not None:
+            return self.atomic_update
+
+        return not (
+            is_method_overridden(self, UpdateMixin, "after_update")
+            or is_method_overridden(self, GenericResource, "get_instance")
+            or is_method_overridden(self.serializer_class, ModelSerializer, "update")
+        )
+
     def put_object(self, request, pk):
         return self._perform_update(pk, request)
 
     def _perform_update(self, pk, request, part=False):
+        if part and self.is_atomic_update():
+            return self._perform_atomic_update(pk, request)
+
         data = self.get_data(request)
         instance = self.get_instance(pk)
 
@@ -175,7 +766,11 @@ class UpdateMixin:
             out.status_code = 400
             return out
 
-        oldInstance = copy.deepcopy(instance)
+        if self.deepcopy_old_instance:
+            oldInstance = copy.deepcopy(instance)
+        else:
+            oldInstance = SnapshotInstanceWrapper(instance)
+
         validated_data = {
             key: value
             for key, value in six.iteritems(serializer.cleaned_data)
@@ -183,18 +778,60 @@ class UpdateMixin:
         }
 
         updatedInstance = serializer.update(instance, validated_data=validated_data)
+        self.invalidate_cache([pk])
         self.after_update(oldInstance, updatedInstance, validated_data)
         return jsonify(self.serializer_class(updatedInstance).serialize())
 
+    def _perform_atomic_update(self, pk, request):
+        data = self.get_data(request)
+        qs = self.get_adaptated_queryset()
+
+        serializer = self.serializer_class(data, context={
+            "instance": LazyInstanceWrapper(qs, pk),
+        })
+
+        if not serializer.validate(part=True):
+            out = jsonify(serializer.errors)
+            out.status_code = 400
+            return out
+
+        validated_data = {
+            key: value
+            for key, value in six.iteritems(serializer.cleaned_data)
+            if key in data and key != "id"
+        }
+
+        updatedInstance = qs.update_one(pk, validated_data)
+        self.invalidate_cache([pk])
+        return jsonify(self.serializer_class(updatedInstance).serialize())
+
     def patch_object(self, request, pk):
         return self._perform_update(pk, request, part=True)
 
 class DeleteMixin:
+    def before_delete(self, instance):
+        """
+        Will be called before deleting instance.
+        If neither it nor get_instance is overridden, record is deleted with one query without loading instance.
+        """
+        pass
+
     def delete_object(self, request, pk):
+        if not (
+            is_method_overridden(self, DeleteMixin, "before_delete")
+            or is_method_overridden(self, GenericResource, "get_instance")
+        ):
+            self.get_adaptated_queryset().delete_one(pk)
+            self.invalidate_cache([pk])
+            return jsonify({"id": str(pk)})
+
         instance = self.get_instance(pk)
         assert isinstance(instance, InstanceWrapper)
+        self.before_delete(instance)
+
         id = instance.get_id()
         instance.delete()
+        self.invalidate_cache([pk])
 
         return jsonify({"id": str(id)})
 
@@ -238,6 +875,9 @@ class ModelResource(GenericResource,
 
             {'f1': '1', 'f2': True, 'f3': '1', 'id': '5864e2a332105b5a350b99bc'}
 
+    POST of list creates many objects at once. Bulk PATCH and DELETE of the list endpoint
+    aren't enabled by default, add :class:`flask_restframework.resource_mixins.bulk.BulkUpdateMixin`
+    and :class:`flask_restframework.model_mixins.DeleteManyMixin` to resource bases for them.
     """
     __metaclass__ = BaseResourceMetaClass
 
@@ -8,10 +8,10 @@ from flask.ext.sqlalchemy import Model, SQLAlchemy
 from flask.globals import current_app
 
 from flask_restframework.fields import EmbeddedField
-from flask_restframework.queryset_wrapper import InstanceWrapper
+from flask_restframework.queryset_wrapper import InstanceWrapper, _has_save_hooks
 from flask_restframework.validators import UniqueValidator
 from flask_restframework.fields import BaseField
-from flask_restframework.utils import mongoengine_model_meta
+from flask_restframework.utils import mongoengine_model_meta, unit_of_work
 import sqlalchemy as sa
 from flask_restframework import fields
 
@@ -53,6 +53,14 @@ class BaseModelWrapper(object):
         """
         raise NotImplementedError
 
+    def bulk_create(self, items):
+        #type: (list[dict])->list
+        """
+        Should create instances for list of attrs in one round trip
+        and return list of created model instances in the same order
+        """
+        raise NotImplementedError
+
 
 
 class BaseFieldWrapper(object):
@@ -162,6 +170,30 @@ class MongoEngineModelWrapper(BaseModelWrapper):
     def create(self, **attrs):
         return self.modelClass.objects.create(**attrs)
 
+    def bulk_create(self, items):
+        """
+        Inserts validated documents with one insert_many.
+        If document has custom clean() or save signal receivers, documents are saved one by one,
+        so they are applied like in :meth:`create`.
+        """
+        documents = [self.modelClass(**attrs) for attrs in items]
+        if not documents:
+            return []
+
+        if _has_save_hooks(self.modelClass):
+            for document in documents:
+                document.save()
+            return documents
+
+        for document in documents:
+            document.validate()
+
+        ids = self.modelClass.objects.insert(documents, load_bulk=False)
+        for document, id in zip(documents, ids):
+            document.pk = id
+
+        return documents
+
     def get_fields(self):
         out = {}
         for key, value in six.iteritems(self.modelClass._fields):
@@ -182,10 +214,26 @@ class SqlAlchemyModelWrapper(BaseModelWrapper):
         instance = self.modelClass(**attrs)
 
         self.db.session.add(instance)
-        self.db.session.commit()
+        unit_of_work.commit(self.db.session, flush=True)
 
         return instance
 
+    def bulk_create(self, items):
+        """
+        Adds instances to session and flushes them together, so rows with passed primary keys
+        are inserted with one executemany INSERT. Instances are created by ORM, so
+        @validates, mapper events and mapped attribute names work like in :meth:`create`.
+        """
+        instances = [self.modelClass(**attrs) for attrs in items]
+        if not instances:
+            return []
+
+        session = self.db.session
+        session.add_all(instances)
+        unit_of_work.commit(session, flush=True)
+
+        return instances
+
     def get_fields(self):
         # type: ()->dict[str, BaseFieldWrapper]
         return {
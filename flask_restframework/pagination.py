@@ -1,27 +1,186 @@
+import base64
+import itertools
+import threading
 from collections import namedtuple
 
+from bson import json_util
+from flask.globals import current_app
+
+from flask_restframework.exceptions import ValidationError
 from flask_restframework.queryset_wrapper import QuerysetWrapper
+from flask_restframework.utils.cache import TTLCache
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:     # python 2 without futures package
+    ThreadPoolExecutor = None
 
 PageInfo = namedtuple("PageInfo", ["page", "page_size"])
 
-class DefaultPagination:
+COUNT_EXACT = "exact"           #qs.count() on each request
+COUNT_NONE = "none"             #total isn't calculated, only has_next is returned
+COUNT_ESTIMATED = "estimated"   #qs.estimated_count(), fast for not filtered querysets
+COUNT_CACHED = "cached"         #qs.count() cached for count_cache_ttl seconds by normalized filter
+
+_app_states_lock = threading.Lock()
+
+
+class _PaginationState(object):
+    "Per application state of pagination, is stored in app.extensions"
+
+    def __init__(self, app):
+        self.app = app
+        self.count_cache = TTLCache(max_size=1000)
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def get_executor(self):
+        "Returns thread pool of application, it is sized by FLASK_REST[\"PAGINATION_THREADS\"] of this application"
+        if self.executor is None:
+            with self.lock:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(
+                        self.app.config.get("FLASK_REST", {}).get("PAGINATION_THREADS", 4)
+                    )
+
+        return self.executor
+
+
+def _get_state(app):
+    "Returns pagination state of app, creates it on first call"
+    state = app.extensions.get("flask_restframework.pagination")
+
+    if state is None:
+        with _app_states_lock:
+            state = app.extensions.get("flask_restframework.pagination")
+            if state is None:
+                state = app.extensions["flask_restframework.pagination"] = _PaginationState(app)
+
+    return state
+
+
+class DefaultPagination(object):
+    """
+    Page number pagination::
+
+        GET <url>?page=2&page_size=10
+
+    How total count is calculated is defined by count_mode attribute or config variable::
+
+        FLASK_REST = {
+            "PAGINATION_COUNT_MODE": "cached"
+        }
+
+    * ``exact`` - qs.count() on each request (default)
+    * ``none`` - total isn't calculated, page_size + 1 items are fetched to detect next page.
+      Response contains has_next instead of total and pages.
+    * ``estimated`` - :meth:`flask_restframework.queryset_wrapper.QuerysetWrapper.estimated_count`,
+      which uses collection/table statistics if queryset isn't filtered
+    * ``cached`` - qs.count() is cached for count_cache_ttl seconds by normalized filter of queryset
+
+    If concurrent_count attribute (or ``FLASK_REST["PAGINATION_CONCURRENT_COUNT"]``) is True and queryset
+    supports concurrent queries, total is counted in thread pool of application
+    (``FLASK_REST["PAGINATION_THREADS"]`` threads, 4 by default) while page is fetched,
+    both results are joined in update_response.
+
+    Count cache and thread pool are created for each application (in ``app.extensions``),
+    count_cache attribute can be set to other :class:`flask_restframework.utils.cache.BaseCache`.
+    """
     qs = None   #type: QuerysetWrapper
 
+    count_mode = None
+    count_cache_ttl = 60
+    count_cache = None  #by default TTLCache of application
+
+    concurrent_count = None
+
     def __init__(self, qs, total=None):
         #type: (QuerysetWrapper, int)->None
 
         assert isinstance(qs, QuerysetWrapper)
 
         self.qs = qs    #type: QuerysetWrapper
-        self.total = 0  #total objects count
         self.count_pages = 0    #total count of pages
         self.page = 0       #current page
         self.page_size = 10 #current page size
+        self.has_next = None    #is there next page (for "none" count mode)
 
-        if total is None:
-            self.total = self.qs.count()
+        self._full_qs = qs  #type: QuerysetWrapper
+        self._count_mode = self.get_count_mode()
+        self._total = None
+        self._total_future = None
+        self._state = _get_state(current_app._get_current_object())  #type: _PaginationState
+
+        if total is not None:
+            self._total = total
+        elif self._count_mode == COUNT_NONE:
+            pass
+        elif self._is_concurrent_count():
+            self._total_future = self._state.get_executor().submit(self._get_total)
         else:
-            self.total = total
+            self._total = self._get_total()
+
+    @property
+    def total(self):
+        "total objects count (None for \"none\" count mode)"
+        if self._total_future is not None:
+            self._total = self._total_future.result()
+            self._total_future = None
+
+        return self._total
+
+    @total.setter
+    def total(self, value):
+        self._total_future = None
+        self._total = value
+
+    def get_count_mode(self):
+        if self.count_mode:
+            return self.count_mode
+        return current_app.config.get("FLASK_REST", {}).get("PAGINATION_COUNT_MODE", COUNT_EXACT)
+
+    def _is_concurrent_count(self):
+        concurrent = self.concurrent_count
+        if concurrent is None:
+            concurrent = current_app.config.get("FLASK_REST", {}).get("PAGINATION_CONCURRENT_COUNT", False)
+
+        return bool(concurrent) and ThreadPoolExecutor is not None and self.qs.supports_concurrent_queries
+
+    def get_count_cache(self):
+        "Returns cache of counts for cached count mode (by default it is own for each application)"
+        if self.count_cache is not None:
+            return self.count_cache
+        return self._state.count_cache
+
+    def _get_count_cache_key(self):
+        "Returns key of count in count cache or None if queryset filter can't be used as key"
+        filter_key = self.qs.get_filter_key()
+        if filter_key is None:
+            return None
+
+        return "count:{}.{}:{}:{}".format(
+            self.__class__.__module__, self.__class__.__name__, self.qs.get_model_key(), filter_key
+        )
+
+    def _get_total(self):
+        "Returns total count of items according to count mode. Can be called outside of app context"
+        count_mode = self._count_mode
+
+        if count_mode == COUNT_ESTIMATED:
+            return self.qs.estimated_count()
+        elif count_mode == COUNT_CACHED:
+            key = self._get_count_cache_key()
+            if key is None:
+                return self.qs.count()
+
+            cache = self.get_count_cache()
+            total = cache.get(key)
+            if total is None:
+                total = self.qs.count()
+                cache.set(key, total, ttl=self.count_cache_ttl)
+            return total
+
+        return self.qs.count()
 
     def paginate(self, request):
         "Perform qs filtration"
@@ -31,21 +190,29 @@ class DefaultPagination:
         page = pageInfo.page
         page_size = pageInfo.page_size
 
-        full_pages = int(self.total / page_size)
-        if self.total % page_size == 0:
-            self.count_pages = full_pages
-        else:
-            self.count_pages = full_pages + 1
-
         self.page = page
         self.page_size = page_size
 
+        if self._count_mode == COUNT_NONE:
+            # fetch one more item to know if there is next page
+            self.qs = self.qs.slice(page_size*(page-1), page_size*page + 1) #type: QuerysetWrapper
+            return
+
         self.qs = self.qs.slice(page_size*(page-1), page_size*page) #type: QuerysetWrapper
 
 
     def update_response(self, data):
         "Updates response: adds information fields like page, page_size etc."
 
+        if self.total is None:
+            return self._update_response_without_total(data)
+
+        full_pages = int(self.total / self.page_size)
+        if self.total % self.page_size == 0:
+            self.count_pages = full_pages
+        else:
+            self.count_pages = full_pages + 1
+
         return {
             "results": data,
             "total": self.total,
@@ -54,6 +221,25 @@ class DefaultPagination:
             "page_size": self.page_size
         }
 
+    def _update_response_without_total(self, data):
+        if isinstance(data, list):
+            self.has_next = len(data) > self.page_size
+            data = data[:self.page_size]
+        else:
+            # streamed data can't be looked ahead, check next item with separate query
+            data = itertools.islice(data, self.page_size)
+            end = self.page_size * self.page
+            self.has_next = bool(list(
+                self._full_qs.slice(end, end + 1).only("id").get_data()
+            ))
+
+        return {
+            "results": data,
+            "has_next": self.has_next,
+            "page": self.page,
+            "page_size": self.page_size
+        }
+
     def _get_page_info(self, request):
         """
         Returns page info
@@ -66,3 +252,180 @@ class DefaultPagination:
             page_size=int(request.args.get("page_size", 10))
         )
 
+
+
+class KeysetPagination:
+    """
+    Pagination by the last seen sort key (cursor pagination).
+    Unlike :class:`DefaultPagination` it doesn't skip rows, so page fetch takes
+    the same time at any depth and total count isn't calculated.
+
+    Ordering is taken from queryset (for example from :class:`flask_restframework.filter_backends.OrderingBackend`),
+    unique tie_breaker field is appended to it. Usage::
+
+        GET <url>?page_size=10
+
+    returns::
+
+        {
+            "results": [...],
+            "next_cursor": "<opaque token or null if it is the last page>",
+            "page_size": 10
+        }
+
+    and next page is requested with ``GET <url>?page_size=10&_cursor=<next_cursor>``
+    (argument starts with underscore, so it isn't used by filter backends).
+
+    Page is fetched with one more item, so next cursor is taken from the page without extra query.
+    Sort key fields should be loaded by queryset
+    (see :meth:`flask_restframework.model_resource.GenericResource.project_qs`).
+    """
+
+    qs = None   #type: QuerysetWrapper
+    tie_breaker = "id"  #unique field which makes ordering strict
+
+    _json_options = json_util.JSONOptions(tz_aware=False)
+
+    def __init__(self, qs):
+        #type: (QuerysetWrapper)->None
+
+        assert isinstance(qs, QuerysetWrapper)
+
+        self.ordering = list(qs.ordering)
+        if self.tie_breaker not in [field.lstrip("-") for field in self.ordering]:
+            self.ordering.append(self.tie_breaker)
+
+        self.qs = qs.order_by(*self.ordering)    #type: QuerysetWrapper
+        self._full_qs = self.qs
+        self.page_size = 10 #current page size
+        self.next_cursor = None #cursor of the next page
+        self._last_item = None  #last item of the page, is set while page is iterated
+
+    def paginate(self, request):
+        "Perform qs filtration"
+
+        self.page_size = int(request.args.get("page_size", 10))
+
+        cursor = request.args.get("_cursor")
+        if cursor:
+            self.qs = self.qs.filter_any(*self._get_range_filters(self.decode_cursor(cursor)))
+
+        self._full_qs = self.qs
+
+        # fetch one more item to know if there is next page
+        self.qs = KeysetPageQuerySet(self.qs.slice(0, self.page_size + 1), self)   #type: QuerysetWrapper
+
+    def update_response(self, data):
+        "Updates response: adds information fields like next_cursor"
+
+        if isinstance(data, list):
+            self.next_cursor = None
+            if len(data) > self.page_size and self._last_item is not None:
+                self.next_cursor = self.encode_cursor(self._get_keys(self._last_item))
+            data = data[:self.page_size]
+        else:
+            # streamed data can't be looked ahead, fetch keys with separate query
+            data = itertools.islice(data, self.page_size)
+            self.next_cursor = self._get_next_cursor()
+
+        return {
+            "results": data,
+            "next_cursor": self.next_cursor,
+            "page_size": self.page_size
+        }
+
+    def encode_cursor(self, values):
+        "Returns opaque token for list of sort key values"
+        data = json_util.dumps(values, json_options=self._json_options)
+        return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, cursor):
+        "Returns list of sort key values from token"
+        try:
+            data = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            values = json_util.loads(data, json_options=self._json_options)
+        except Exception:
+            raise ValidationError("Incorrect cursor")
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError("Incorrect cursor")
+
+        return values
+
+    def _get_range_filters(self, values):
+        """
+        Returns filters for filter_any, which select rows after values in ordering:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        """
+        filters = []
+
+        for i, field in enumerate(self.ordering):
+            f = {
+                prev.lstrip("-"): value
+                for prev, value in zip(self.ordering[:i], values)
+            }
+
+            lookup = "lt" if field.startswith("-") else "gt"
+            f["{}__{}".format(field.lstrip("-"), lookup)] = values[i]
+
+            filters.append(f)
+
+        return filters
+
+    def _get_keys(self, item):
+        "Returns sort key values of item"
+        return [item.get_field(field.lstrip("-")) for field in self.ordering]
+
+    def _get_next_cursor(self):
+        "Fetches only sort keys of the page (and one item after it) and returns cursor of the next page"
+        fields = [field.lstrip("-") for field in self.ordering]
+
+        keys = [
+            self._get_keys(item)
+            for item in self._full_qs.slice(0, self.page_size + 1).only(*fields).get_data()
+        ]
+
+        if len(keys) <= self.page_size:
+            return None
+
+        return self.encode_cursor(keys[self.page_size - 1])
+
+
+class KeysetPageQuerySet(QuerysetWrapper):
+    """
+    Wrapper for page queryset of :class:`KeysetPagination`, which saves last item
+    of the page to pagination while page is iterated, so next cursor is taken from it.
+    """
+
+    def __init__(self, qs, pagination):
+        #type: (QuerysetWrapper, KeysetPagination)->None
+        super(KeysetPageQuerySet, self).__init__(qs, qs.wrapperType)
+        self.pagination = pagination
+
+    @property
+    def ordering(self):
+        return self.data.ordering
+
+    def _wrap(self, qs):
+        return KeysetPageQuerySet(qs, self.pagination)
+
+    def get_data(self):
+        for index, item in enumerate(self.data.get_data()):
+            if index == self.pagination.page_size - 1:
+                self.pagination._last_item = item
+            yield item
+
+    def count(self):
+        return self.data.count()
+
+    def first(self):
+        return self.data.first()
+
+    def only(self, *paths):
+        return self._wrap(self.data.only(*paths))
+
+    def as_raw(self):
+        return self._wrap(self.data.as_raw())
+
+    def prefetch_related(self, *paths):
+        return self._wrap(self.data.prefetch_related(*paths))
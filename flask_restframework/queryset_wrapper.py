@@ -1,12 +1,36 @@
 #coding: utf8
+import copy
+import functools
+import operator
+
+import six
+
 from flask.ext.sqlalchemy import Model, BaseQuery, _BoundDeclarativeMeta
 from flask.globals import current_app
+import sqlalchemy as sa
+from sqlalchemy.orm import load_only, object_session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from mongoengine.base.document import BaseDocument
 from mongoengine.document import Document
+from mongoengine.errors import DoesNotExist, ValidationError as MongoValidationError
+from mongoengine import signals as mongo_signals
+from mongoengine import fields as mongo_fields
+from mongoengine.queryset.visitor import Q
 from mongoengine.queryset.queryset import QuerySet
+from mongoengine.queryset import transform
+from bson import json_util
+from bson.dbref import DBRef
+from bson.objectid import ObjectId
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
 from pymongo.cursor import Cursor
 from sqlalchemy.sql.expression import desc
 
+from flask_restframework.exceptions import NotFound
+from flask_restframework.utils import unit_of_work
+from flask_restframework.utils.cache import get_generation, bump_generation
+from flask_restframework.utils.util import is_method_overridden
+
 
 class InstanceWrapper(object):
     """
@@ -17,6 +41,7 @@ class InstanceWrapper(object):
     """
     def __init__(self, item):
         self.item = item
+        self.old_values = {}    #values of fields before last update call
 
     def get_id(self):
         """
@@ -31,7 +56,19 @@ class InstanceWrapper(object):
         """
         raise NotImplementedError
 
+    def get_raw_field(self, key):
+        """
+        Returns value of field key without dereferencing of references
+        (for example DBRef instead of referenced document).
+        By default is the same as get_field
+        """
+        return self.get_field(key)
+
     def update(self, validated_data):
+        """
+        Should update instance fields from validated_data and save it.
+        Old values of changed fields should be saved in old_values.
+        """
         raise NotImplementedError
 
     def to_dict(self):
@@ -46,6 +83,25 @@ class InstanceWrapper(object):
         """
         raise NotImplementedError
 
+    def attach(self):
+        """
+        Returns instance which can be used in current request.
+        Is called for instances taken from cache, by default instance is returned as is.
+        """
+        return self
+
+    def detached_copy(self, values):
+        """
+        Returns copy of model item with fields from values, which isn't bound to database.
+        By default item is deep copied.
+        """
+        item = copy.deepcopy(self.item)
+
+        for key, value in values.items():
+            setattr(item, key, value)
+
+        return item
+
     @classmethod
     def from_instance(cls, item):
         """
@@ -76,11 +132,28 @@ class MongoInstanceWrapper(InstanceWrapper):
         return self.item.pk
 
     def update(self, validated_data):
+        self.old_values = dict(
+            (key, getattr(self.item, key, None))
+            for key in validated_data
+        )
+
         for key, value in validated_data.items():
             setattr(self.item, key, value)
 
         self.item.save()
 
+    def attach(self):
+        # cached documents are shared between requests and threads, each request gets its own copy
+        return _copy_wrapper(self)
+
+    def detached_copy(self, values):
+        if isinstance(self.item, dict):
+            return dict(self.item, **values)
+
+        data = dict(self.item._data)
+        data.update(values)
+        return self.item.__class__(**data)
+
     def get_field(self, key):
         out = self.item
 
@@ -104,6 +177,22 @@ class MongoInstanceWrapper(InstanceWrapper):
 
         return out
 
+    def get_raw_field(self, key):
+        parts = key.split("__")
+        out = self.item
+
+        for part in parts[:-1]:
+            try:
+                out = getattr(out, part)
+            except:
+                return None
+
+        if isinstance(out, BaseDocument):
+            # _data keeps DBRef of not dereferenced ReferenceField
+            return out._data.get(parts[-1])
+
+        return self.get_field(key)
+
 
 class SqlAlchemyInstanceWrapper(InstanceWrapper):
 
@@ -117,19 +206,45 @@ class SqlAlchemyInstanceWrapper(InstanceWrapper):
 
         return self.__db
 
+    @property
+    def session(self):
+        "Session of wrapped instance or default session of SqlAlchemyModelWrapper.db"
+        return object_session(self.item) or self.db.session
+
     def update(self, validated_data):
+        self.old_values = dict(
+            (key, getattr(self.item, key, None))
+            for key in validated_data
+        )
+
         for key, value in validated_data.items():
             setattr(self.item, key, value)
 
-        self.db.add(self.item)
-        self.db.commit()
+        session = self.session
+        session.add(self.item)
+        unit_of_work.commit(session)
 
     def get_id(self):
         return self.item.id
 
     def delete(self):
-        self.db.delete(self.item)
-        self.db.commit()
+        session = self.session
+        session.delete(self.item)
+        unit_of_work.commit(session)
+
+    def attach(self):
+        # instance from cache is detached from (or belongs to closed) session,
+        # merge it without query to load lazy relations in the current session
+        return self.__class__(self.db.session.merge(self.item, load=False))
+
+    def detached_copy(self, values):
+        mapper = sa.inspect(self.item).mapper
+        item = mapper.class_manager.new_instance()
+
+        for key in mapper.column_attrs.keys():
+            set_committed_value(item, key, values[key] if key in values else getattr(self.item, key))
+
+        return item
 
     def to_dict(self):
         return {
@@ -157,6 +272,13 @@ class CursorInstanceWrapper(InstanceWrapper):
     def to_dict(self):
         return dict(self.item)
 
+    def attach(self):
+        # cached records are shared between requests and threads, each request gets its own copy
+        return _copy_wrapper(self)
+
+    def detached_copy(self, values):
+        return dict(self.item, **values)
+
     def get_id(self):
         return self.item["_id"]
 
@@ -187,10 +309,164 @@ class CursorInstanceWrapper(InstanceWrapper):
 
         return out
 
+
+def _copy_wrapper(wrapper):
+    "Returns wrapper of the same type with deep copy of wrapped item"
+    out = copy.copy(wrapper)
+    out.item = copy.deepcopy(wrapper.item)
+    out.old_values = {}
+    return out
+
+
+def _get_embedded_document_type(field):
+    "Returns EmbeddedDocument class for mongoengine field (or list of embedded documents)"
+    if isinstance(field, mongo_fields.ListField):
+        field = field.field
+
+    if isinstance(field, mongo_fields.EmbeddedDocumentField):
+        return field.document_type
+
+
+class LazyInstanceWrapper(InstanceWrapper):
+    """
+    Wrapper for record which is known only by its id.
+    Record is loaded from queryset on first access to its data, so code which
+    needs only get_id (for example UniqueValidator) doesn't make queries.
+    """
+
+    def __init__(self, qs, id):
+        #type: (QuerysetWrapper, Any)->None
+        self.qs = qs
+        self.id = id
+        self._instance = None
+
+    @property
+    def instance(self):
+        #type: ()->InstanceWrapper
+        if self._instance is None:
+            self._instance = self.qs.get(self.id)
+        return self._instance
+
+    @property
+    def item(self):
+        return self.instance.item
+
+    @property
+    def old_values(self):
+        return self.instance.old_values
+
+    def get_id(self):
+        return self.id
+
+    def get_field(self, key):
+        return self.instance.get_field(key)
+
+    def update(self, validated_data):
+        return self.instance.update(validated_data)
+
+    def to_dict(self):
+        return self.instance.to_dict()
+
+    def delete(self):
+        return self.instance.delete()
+
+
+class SnapshotInstanceWrapper(InstanceWrapper):
+    """
+    State of instance before update.
+
+    Changed fields are taken from instance.old_values (raw values, without wrapping),
+    other fields from instance itself. So snapshot costs nothing and doesn't depend on
+    document size. Model item of snapshot is detached copy of instance with old values
+    (see :meth:`InstanceWrapper.detached_copy`), it is built on first access.
+    """
+
+    def __init__(self, instance):
+        #type: (InstanceWrapper)->None
+        self.instance = instance
+        self._item = None
+
+    @property
+    def item(self):
+        if self._item is None:
+            self._item = self.instance.detached_copy(self.old_values)
+        return self._item
+
+    @property
+    def old_values(self):
+        return self.instance.old_values
+
+    def get_id(self):
+        return self.instance.get_id()
+
+    def get_field(self, key):
+        parts = key.split("__")
+
+        if parts[0] not in self.old_values:
+            return self.instance.get_field(key)
+
+        out = self.old_values[parts[0]]
+        for part in parts[1:]:
+            if isinstance(out, dict):
+                out = out.get(part)
+            else:
+                out = getattr(out, part, None)
+
+        return out
+
+    def to_dict(self):
+        out = dict(self.instance.to_dict())
+        out.update(self.old_values)
+        return out
+
+
+class RawMongoInstanceWrapper(CursorInstanceWrapper):
+    """
+    Wrapper for raw pymongo dict of mongoengine document (see :meth:`MongoDbQuerySet.as_raw`).
+    Maps document field names to db_field names, including embedded documents.
+    References are stored as ids, so paths through them can't be read.
+    """
+    def __init__(self, item, document):
+        super(RawMongoInstanceWrapper, self).__init__(item)
+        self.document = document
+
+    def get_field(self, key):
+        out = self.item
+        document = self.document
+
+        for part in key.split("__"):
+            field = document._fields.get(part) if document else None
+
+            if isinstance(out, dict):
+                out = out.get(field.db_field if field else part)
+            elif isinstance(out, (ObjectId, DBRef)):
+                raise ValueError(
+                    "Path {} goes through reference, it can't be read from raw record".format(key)
+                )
+            else:
+                return None
+
+            document = _get_embedded_document_type(field)
+
+        if isinstance(out, dict):
+            return RawMongoInstanceWrapper(out, document)
+        if isinstance(out, list):
+            return [
+                RawMongoInstanceWrapper(item, document) if isinstance(item, dict) else item
+                for item in out
+            ]
+
+        return out
+
+
 class QuerysetWrapper(object):
     """
     Обертка для Queryset.
     """
+
+    ordering = ()   #ordering passed to last order_by call
+    supports_concurrent_queries = False   #if True, queryset can be evaluated in other thread
+
     def __init__(self, data, wrapperType):
         self.wrapperType = wrapperType
         self.data = data
@@ -223,6 +499,18 @@ class QuerysetWrapper(object):
 
         raise TypeError("Unknown type {}".format(type(qs)))
 
+    def _clone(self, data, **state):
+        #type: (Any)->QuerysetWrapper
+        """
+        Returns new wrapper of the same type for data.
+        Wrapper state (for example prefetched paths) is copied and updated from state.
+        """
+        qs = self.__class__.__new__(self.__class__)
+        qs.__dict__.update(self.__dict__)
+        qs.__dict__.update(state)
+        qs.data = data
+        return qs
+
     def get(self, id):
         #type: (Any)->InstanceWrapper
         """Should return one instance by it id"""
@@ -244,6 +532,35 @@ class QuerysetWrapper(object):
         """
         raise NotImplementedError
 
+    def estimated_count(self):
+        """
+        Returns fast approximate count of items (for example from collection/table statistics).
+        By default returns exact count.
+        """
+        return self.count()
+
+    def get_filter_key(self):
+        """
+        Returns normalized string representation of queryset filters, which can be used
+        as cache key, or None if it isn't supported.
+        """
+        return None
+
+    def get_model_key(self):
+        """
+        Returns name of queried model (collection or table), which is used
+        for cache invalidation, or None if it isn't supported.
+        """
+        return None
+
+    def get_cache_key(self):
+        """
+        Returns normalized string representation of whole query (filters, ordering,
+        slice and projection), which can be used as cache key of results,
+        or None if it isn't supported.
+        """
+        return None
+
     def slice(self, frm, to):
         """
         Should slice queryset
@@ -258,10 +575,28 @@ class QuerysetWrapper(object):
         """
         raise NotImplementedError
 
+    def filter_any(self, *filters):
+        #type: (list[dict])->QuerysetWrapper
+        """
+        Should filter queryset by any of passed filters (OR).
+        Each filter is dict in the filter_by format.
+        Returns new queryset
+        """
+        raise NotImplementedError
+
+    def filter_raw(self, spec):
+        #type: (dict)->QuerysetWrapper
+        """
+        Should filter queryset by raw MongoDB query spec.
+        Returns new queryset
+        """
+        raise NotImplementedError
+
     def order_by(self, *ordering):
         #type: (list[str])->QuerysetWrapper
         """
         Should return ordered queryset.
+        Passed ordering should be saved in ordering attribute.
 
         :param ordering: list of fields: "field" for ASC, "-field" for DESC
         """
@@ -273,83 +608,835 @@ class QuerysetWrapper(object):
         """
         raise NotImplementedError
 
+    def update_one(self, id, data):
+        #type: (Any, dict)->InstanceWrapper
+        """
+        Updates fields from data of one record and returns updated instance.
+        Raises NotFound if there is no record with id in queryset.
+
+        Backends should do it with one atomic update query, by default
+        instance is loaded, updated and saved.
+        """
+        instance = self.get(id)
+        instance.update(data)
+        return instance
+
+    def delete_one(self, id):
+        """
+        Deletes one record by id and raises NotFound if there is no record with id in queryset.
+
+        Backends should do it with one delete query, by default
+        instance is loaded and deleted.
+        """
+        self.get(id).delete()
+
+    def bulk_update(self, updates):
+        #type: (list[tuple])->int
+        """
+        Should update many records of queryset in one round trip.
+
+        :param updates: list of (id, validated_data) pairs
+        :return: count of updated records
+        """
+        raise NotImplementedError
+
+    def bulk_delete(self, ids):
+        #type: (list)->int
+        """
+        Should delete records of queryset with passed ids in one query.
+        Returns count of deleted records
+        """
+        raise NotImplementedError
+
+    def only(self, *paths):
+        #type: (list[str])->QuerysetWrapper
+        """
+        Returns queryset which loads only fields needed for paths.
+        By default projection isn't supported and queryset is returned as is.
+
+        :param paths: list of model paths in Django __ notation, for example "author__name"
+        """
+        return self
+
+    def stream(self, batch_size):
+        #type: (int)->QuerysetWrapper
+        """
+        Returns queryset which fetches records from database by batches of batch_size
+        while iterating (server side cursor), so memory doesn't depend on queryset size.
+        By default queryset is returned as is.
+        """
+        return self
+
+    def as_raw(self):
+        #type: ()->QuerysetWrapper
+        """
+        Returns queryset which fetches raw database records instead of model instances.
+        It is faster, but serializer MethodFields will get raw records too.
+        By default isn't supported and queryset is returned as is.
+        """
+        return self
+
+    def prefetch_related(self, *paths):
+        #type: (list[str])->QuerysetWrapper
+        """
+        Returns queryset which loads related objects for paths with one query per relation
+        instead of lazy loading them for each item.
+        By default prefetching isn't supported and queryset is returned as is.
+
+        :param paths: list of relation paths in Django __ notation, for example "author__company"
+        """
+        return self
+
+
+def _prefetch_mongo_path(documents, path):
+    """
+    Bulk dereferences ReferenceFields (and lists of them) along path for documents.
+    Embedded documents on the path are traversed without queries.
+    """
+    for part in path.split("__"):
+        next_level = []
+        to_fetch = {}   #document_type: set of ids
+
+        for doc in documents:
+            field = doc._fields.get(part)
+            value = doc._data.get(part)
+
+            if isinstance(field, mongo_fields.ListField):
+                field = field.field
+                values = value or []
+            else:
+                values = [value]
+
+            if isinstance(field, mongo_fields.ReferenceField):
+                for value in values:
+                    if isinstance(value, DBRef):
+                        to_fetch.setdefault(field.document_type, set()).add(value.id)
+            elif isinstance(field, mongo_fields.EmbeddedDocumentField):
+                next_level.extend(value for value in values if value is not None)
+
+        fetched = {}
+        for document_type, ids in to_fetch.items():
+            fetched[document_type] = document_type.objects.in_bulk(list(ids))
+
+        for doc in documents:
+            field = doc._fields.get(part)
+            value = doc._data.get(part)
+
+            is_list = isinstance(field, mongo_fields.ListField)
+            if is_list:
+                field = field.field
+
+            if not isinstance(field, mongo_fields.ReferenceField) or not value:
+                continue
+
+            by_id = fetched.get(field.document_type, {})
+
+            def resolve(value):
+                if isinstance(value, DBRef):
+                    return by_id.get(value.id, value)
+                return value
+
+            if is_list:
+                doc._data[part] = [resolve(item) for item in value]
+                next_level.extend(item for item in doc._data[part] if isinstance(item, BaseDocument))
+            else:
+                doc._data[part] = resolve(value)
+                if isinstance(doc._data[part], BaseDocument):
+                    next_level.append(doc._data[part])
+
+        documents = next_level
+        if not documents:
+            return
+
 
 class MongoDbQuerySet(QuerysetWrapper):
     """
     Обертка для MongoEngine Queryset
     """
 
+    supports_concurrent_queries = True
+
+    _prefetch = ()
+    prefetch_batch_size = 100   #count of documents which are dereferenced together
+
+    def get_data(self):
+        if not self._prefetch:
+            for item in super(MongoDbQuerySet, self).get_data():
+                yield item
+            return
+
+        chunk = []
+        for item in self.data:
+            chunk.append(item)
+
+            if len(chunk) >= self.prefetch_batch_size:
+                for wrapped in self._prefetch_chunk(chunk):
+                    yield wrapped
+                chunk = []
+
+        for wrapped in self._prefetch_chunk(chunk):
+            yield wrapped
+
+    def _prefetch_chunk(self, documents):
+        if documents:
+            for path in self._prefetch:
+                _prefetch_mongo_path(documents, path)
+
+        return [self.wrapperType(doc) for doc in documents]
+
+    def prefetch_related(self, *paths):
+        return self._clone(self.data, _prefetch=tuple(self._prefetch) + tuple(paths))
+
     def first(self):
         return self.data.first()
 
     def order_by(self, *ordering):
-        return MongoDbQuerySet(self.data.order_by(*ordering), self.wrapperType)
+        return self._clone(self.data.order_by(*ordering), ordering=ordering)
 
     def filter_by(self, **filters):
-        return MongoDbQuerySet(self.data.filter(**filters), self.wrapperType)
+        return self._clone(self.data.filter(**filters))
+
+    def filter_any(self, *filters):
+        query = functools.reduce(operator.or_, [Q(**f) for f in filters])
+        return self._clone(self.data.filter(query))
+
+    def filter_raw(self, spec):
+        return self._clone(self.data.filter(__raw__=spec))
 
     def slice(self, frm, to):
-        return MongoDbQuerySet(self.data[frm:to], self.wrapperType)
+        return self._clone(self.data[frm:to])
+
+    def only(self, *paths):
+        # projection is done by top level fields: for references and embedded
+        # documents whole field is loaded
+        fields = self.data._document._fields
+        names = set(
+            path.split("__")[0]
+            for path in paths
+        )
+
+        if not names or not names.issubset(fields):
+            # path isn't document field (for example property of model),
+            # it can read any field, so whole documents are loaded
+            return self
+
+        return self._clone(self.data.only(*names))
+
+    def stream(self, batch_size):
+        return self._clone(self.data.batch_size(batch_size))
 
     def get(self, id):
         return self.wrapperType(self.data.get(id=id))
 
     def count(self):
-        return self.data.count()
+        # count on clone: queryset caches cursor and count can be called from other thread
+        return self.data.clone().count()
+
+    def estimated_count(self):
+        if self.data._query:
+            return self.count()
+
+        collection = self.data._collection
+        if hasattr(collection, "estimated_document_count"):
+            return collection.estimated_document_count()
+        return collection.count()
+
+    def _get_id_spec(self, id):
+        "Returns raw query for record with id inside of this queryset"
+        document = self.data._document
+
+        try:
+            spec = {"_id": document._fields[document._meta["id_field"]].to_mongo(id)}
+        except Exception:
+            raise NotFound("Object with id={} not found".format(id))
+
+        if self.data._query:
+            spec = {"$and": [self.data._query, spec]}
+        return spec
+
+    def _get_update(self, data):
+        "Returns raw update for setting fields from data, keys which aren't document fields are skipped"
+        fields = self.data._document._fields
+
+        return transform.update(
+            self.data._document,
+            **dict(("set__" + key, value) for key, value in data.items() if key in fields)
+        )
+
+    def update_one(self, id, data):
+        """
+        Updates record with one find_one_and_update query. Updated values are validated
+        like Document.validate does it. If document has custom clean() or receivers of save
+        signals, they need loaded document, so it is loaded, updated and saved.
+        """
+        document = self.data._document
+
+        if _has_save_hooks(document):
+            try:
+                instance = self.get(id)
+            except (DoesNotExist, MongoValidationError):
+                raise NotFound("Object with id={} not found".format(id))
+
+            instance.update(data)
+            return instance
+
+        collection = document._get_collection()
+
+        data = dict((key, value) for key, value in data.items() if key in document._fields)
+
+        if data:
+            _validate_mongo_fields(document, data)
+
+            raw = collection.find_one_and_update(
+                self._get_id_spec(id), self._get_update(data),
+                return_document=ReturnDocument.AFTER
+            )
+        else:
+            raw = collection.find_one(self._get_id_spec(id))
+
+        if raw is None:
+            raise NotFound("Object with id={} not found".format(id))
+
+        return MongoInstanceWrapper(document._from_son(raw))
+
+    def delete_one(self, id):
+        try:
+            # mongoengine applies delete rules and signals here if document has them
+            deleted = self.data.filter(pk=id).delete()
+        except MongoValidationError:
+            deleted = 0
+
+        if not deleted:
+            raise NotFound("Object with id={} not found".format(id))
+
+    def bulk_update(self, updates):
+        requests = []
+        for id, data in updates:
+            update = self._get_update(data)
+            if update:
+                requests.append(UpdateOne(self._get_id_spec(id), update))
+
+        if not requests:
+            return 0
+
+        return self.data._document._get_collection().bulk_write(requests, ordered=False).matched_count
+
+    def bulk_delete(self, ids):
+        return self.data.filter(pk__in=list(ids)).delete()
+
+    def get_filter_key(self):
+        return "{}:{}".format(
+            self.data._document._get_collection_name(),
+            json_util.dumps(self.data._query, sort_keys=True)
+        )
+
+    def get_model_key(self):
+        return self.data._document._get_collection_name()
+
+    def get_cache_key(self):
+        data = self.data
+        return json_util.dumps([
+            self.get_model_key(), data._query, data._ordering, data._skip, data._limit,
+            data._loaded_fields.as_dict()
+        ], sort_keys=True)
+
+    def as_raw(self):
+        document = self.data._document
+
+        return MongoRawQuerySet(
+            self.data.as_pymongo(),
+            functools.partial(RawMongoInstanceWrapper, document=document)
+        )
+
+
+class MongoRawQuerySet(MongoDbQuerySet):
+    """
+    Wrapper for MongoEngine Queryset in as_pymongo mode.
+    Skips Document construction, records are wrapped with :class:`RawMongoInstanceWrapper`
+    """
+
+    def as_raw(self):
+        return self
+
+    def prefetch_related(self, *paths):
+        """
+        References are left as ids in raw mode, so if paths go through references,
+        queryset of documents is returned and references are prefetched for it.
+        """
+        document = self.data._document
+        if not any(_is_reference_path(document, path) for path in paths):
+            return self
+
+        data = self.data.clone()
+        data._as_pymongo = False
+
+        qs = MongoDbQuerySet(data, MongoInstanceWrapper)
+        qs.ordering = self.ordering
+        return qs.prefetch_related(*paths)
+
+
+def _is_reference_path(document, path):
+    "Returns True if path of mongoengine document goes through reference field"
+    for part in path.split("__"):
+        field = document._fields.get(part) if document else None
+
+        if isinstance(field, mongo_fields.ListField):
+            field = field.field
+
+        if isinstance(field, (mongo_fields.ReferenceField, mongo_fields.GenericReferenceField,
+                              mongo_fields.LazyReferenceField, mongo_fields.CachedReferenceField)):
+            return True
+
+        document = _get_embedded_document_type(field)
+
+    return False
+
 
 class CursorQuerySet(QuerysetWrapper):
     """
     Обертка для pymongo.Cursor
+
+    Queryset is lazy: filters, ordering, projection and slicing are saved
+    in the query spec and new cursor is created only on iteration.
+    So the wrapper can be iterated many times and slice/count are done on the server side.
     """
+
+    supports_concurrent_queries = True
+
     def __init__(self, *a, **k):
         super(CursorQuerySet, self).__init__(*a, **k)
-        self.data = list(self.data)
+
+        cursor = self.data  #type: Cursor
+        self.collection = cursor.collection
+        self.spec = getattr(cursor, "_Cursor__spec", None) or {}
+        self.projection = getattr(cursor, "_Cursor__projection", None)
+        self.sort = list((getattr(cursor, "_Cursor__ordering", None) or {}).items())
+        self.skip = getattr(cursor, "_Cursor__skip", 0)
+        self.limit = getattr(cursor, "_Cursor__limit", 0)
+        self.batch_size = getattr(cursor, "_Cursor__batch_size", 0)
+
+    def _get_cursor(self):
+        #type: ()->Cursor
+        "Returns new pymongo cursor for saved query"
+        cursor = self.collection.find(
+            self.spec, self.projection, skip=self.skip, limit=self.limit
+        )
+
+        if self.sort:
+            cursor = cursor.sort(self.sort)
+
+        if self.batch_size:
+            cursor = cursor.batch_size(self.batch_size)
+
+        return cursor
+
+    def get_data(self):
+        for item in self._get_cursor():
+            yield self.wrapperType(item)
+
+    def _and(self, spec):
+        if not self.spec:
+            return spec
+        return {"$and": [self.spec, spec]}
+
+    def _get_spec(self, filters):
+        "Converts Django style filters to the mongo query spec"
+        normalized = {}
+
+        for key, value in filters.items():
+            parts = key.split("__")
+            if parts[0] == "id":
+                parts[0] = "_id"
+                value = _to_object_id(value)
+            normalized["__".join(parts)] = value
+
+        return transform.query(**normalized)
 
     def count(self):
-        return len(self.data)
+        kwargs = {}
+        if self.skip:
+            kwargs["skip"] = self.skip
+        if self.limit:
+            kwargs["limit"] = self.limit
+
+        if hasattr(self.collection, "count_documents"):
+            return self.collection.count_documents(self.spec, **kwargs)
+        return self._get_cursor().count(with_limit_and_skip=True)
+
+    def estimated_count(self):
+        if self.spec or self.skip or self.limit:
+            return self.count()
+
+        if hasattr(self.collection, "estimated_document_count"):
+            return self.collection.estimated_document_count()
+        return self.collection.count()
+
+    def get_filter_key(self):
+        return "{}:{}".format(
+            self.collection.name,
+            json_util.dumps(self.spec, sort_keys=True)
+        )
+
+    def get_model_key(self):
+        return self.collection.name
+
+    def get_cache_key(self):
+        return json_util.dumps([
+            self.collection.name, self.spec, self.projection, self.sort, self.skip, self.limit
+        ], sort_keys=True)
+
+    def update_one(self, id, data):
+        spec = self._and({"_id": _to_object_id(id)})
+
+        if data:
+            item = self.collection.find_one_and_update(
+                spec, {"$set": data}, self.projection, return_document=ReturnDocument.AFTER
+            )
+        else:
+            item = self.collection.find_one(spec, self.projection)
+
+        if item is None:
+            raise NotFound("Object with id={} not found".format(id))
+
+        return self.wrapperType(item)
+
+    def delete_one(self, id):
+        result = self.collection.delete_one(self._and({"_id": _to_object_id(id)}))
+
+        if not result.deleted_count:
+            raise NotFound("Object with id={} not found".format(id))
+
+    def bulk_update(self, updates):
+        requests = [
+            UpdateOne(self._and({"_id": _to_object_id(id)}), {"$set": data})
+            for id, data in updates
+            if data
+        ]
 
-    def filter_by(self, id=None):
-        return CursorQuerySet(filter(
-            lambda item: item["_id"]==id,
-            self.data
-        ), wrapperType=self.wrapperType)
+        if not requests:
+            return 0
+
+        return self.collection.bulk_write(requests, ordered=False).matched_count
+
+    def bulk_delete(self, ids):
+        return self.collection.delete_many(
+            self._and({"_id": {"$in": _to_object_id(list(ids))}})
+        ).deleted_count
+
+    def get(self, id):
+        item = self.collection.find_one(
+            self._and({"_id": _to_object_id(id)}), self.projection
+        )
+
+        if item is None:
+            raise NotFound("Object with id={} not found".format(id))
+
+        return self.wrapperType(item)
+
+    def first(self):
+        for item in self.slice(0, 1).get_data():
+            return item
+
+    def filter_by(self, **filters):
+        return self._clone(self.data, spec=self._and(self._get_spec(filters)))
+
+    def filter_any(self, *filters):
+        return self._clone(self.data, spec=self._and({
+            "$or": [self._get_spec(f) for f in filters]
+        }))
+
+    def filter_raw(self, spec):
+        return self._clone(self.data, spec=self._and(spec))
+
+    def order_by(self, *ordering):
+        sort = []
+        for col in ordering:
+            direction = DESCENDING if col.startswith("-") else ASCENDING
+            name = col.lstrip("-")
+            if name == "id":
+                name = "_id"
+            sort.append((name.replace("__", "."), direction))
+
+        return self._clone(self.data, sort=sort, ordering=ordering)
+
+    def only(self, *paths):
+        if self.projection:
+            # projection was set on the original cursor, don't extend it
+            return self
+
+        names = set(path.split("__")[0] for path in paths)
+        names.discard("id")
+
+        return self._clone(self.data, projection=dict((name, 1) for name in names))
+
+    def stream(self, batch_size):
+        return self._clone(self.data, batch_size=batch_size)
 
     def slice(self, frm, to):
-        return self.data[frm: to]
+        limit = to - frm
+        if self.limit:
+            limit = min(limit, self.limit - frm)
+
+        if limit <= 0:
+            # pymongo treats limit 0 as no limit, so empty slice is done by the spec
+            return self._clone(self.data, spec={"_id": {"$in": []}}, skip=0, limit=0)
+
+        return self._clone(self.data, skip=self.skip + frm, limit=limit)
+
+
+_SAVE_SIGNALS = (mongo_signals.pre_save, mongo_signals.pre_save_post_validation, mongo_signals.post_save)
+
+
+def _has_save_hooks(document):
+    "Returns True if mongoengine document class has custom clean() or receivers of save signals"
+    if is_method_overridden(document, Document, "clean"):
+        return True
+
+    return mongo_signals.signals_available and any(
+        signal.has_receivers_for(document) for signal in _SAVE_SIGNALS
+    )
+
+
+def _validate_mongo_fields(document, data):
+    "Validates values of document fields from data, raises mongoengine ValidationError like Document.validate"
+    errors = {}
+
+    for key, value in data.items():
+        field = document._fields[key]
+
+        try:
+            if value is not None:
+                field._validate(value)
+            elif field.required:
+                raise MongoValidationError("Field is required", field_name=key)
+        except MongoValidationError as e:
+            errors[key] = e.errors or e
+
+    if errors:
+        raise MongoValidationError("ValidationError ({})".format(document._class_name), errors=errors)
+
+
+def _has_delete_hooks(mapper):
+    "Returns True if SQLAlchemy mapper has relations, which are deleted by session, or delete event listeners"
+    for relation in mapper.relationships:
+        if relation.cascade.delete or relation.secondary is not None:
+            return True
+
+    return bool(mapper.dispatch.before_delete or mapper.dispatch.after_delete)
+
+
+def _to_pk_value(column, value):
+    "Converts id (for example string from url) to python type of primary key column"
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if isinstance(value, python_type):
+        return value
+
+    try:
+        return python_type(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_object_id(value):
+    "Converts string ids (for example from url) to ObjectId"
+    if isinstance(value, (list, tuple, set)):
+        return [_to_object_id(item) for item in value]
+
+    if isinstance(value, six.string_types) and ObjectId.is_valid(value):
+        return ObjectId(value)
+
+    return value
+
 
 class SqlAlchemyQuerySet(QuerysetWrapper):
+    #: compiled clause builders by (model, filter key)
+    _clause_builders = {}
+
     def first(self):
         item = self.data.first()
         if item:
             return SqlAlchemyInstanceWrapper(item)
 
     def slice(self, frm, to):
-        return SqlAlchemyQuerySet(self.data.limit(to-frm).offset(frm), SqlAlchemyInstanceWrapper)
+        return self._clone(self.data.limit(to-frm).offset(frm))
 
     def get(self, id):
-        return self.data.get(id=id)
+        # Query.get doesn't work with filtered queries
+        column, key = self._get_pk()
+        item = self.data.filter(column == id).first()
+        if item is None:
+            raise NotFound("Object not found")
+        return self.wrapperType(item)
 
     def count(self):
         return self.data.count()
 
+    def estimated_count(self):
+        model = self._get_model()
+        session = self.data.session
+
+        if self.data.whereclause is None and session.get_bind(sa.inspect(model)).dialect.name == "postgresql":
+            estimated = session.execute(
+                sa.text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": model.__table__.name}
+            ).scalar()
+
+            # statistics can be absent for new tables
+            if estimated and estimated > 0:
+                return int(estimated)
+
+        return self.count()
+
+    def get_filter_key(self):
+        table = self._get_model().__table__.name
+        clause = self.data.whereclause
+
+        if clause is None:
+            return table
+
+        compiled = clause.compile()
+        return "{}:{}:{}".format(table, compiled, sorted(compiled.params.items()))
+
+    def get_model_key(self):
+        return self._get_model().__table__.name
+
+    def get_cache_key(self):
+        # statement contains filters, ordering, limit/offset and columns of load_only
+        compiled = self.data.statement.compile()
+        return "{}:{}:{}".format(self.get_model_key(), compiled, sorted(compiled.params.items()))
+
+    def _get_pk(self):
+        "Returns (primary key column, mapper attribute name)"
+        mapper = sa.inspect(self._get_model())
+        column = mapper.primary_key[0]
+        return column, mapper.get_property_by_column(column).key
+
+    def _get_column_values(self, data):
+        "Returns values of data for mapped columns, other keys are skipped"
+        columns = sa.inspect(self._get_model()).column_attrs
+        return dict((key, value) for key, value in data.items() if key in columns)
+
+    def update_one(self, id, data):
+        """
+        Updates record with UPDATE query, then reads it with SELECT in the same transaction
+        (before commit), so on databases with row locks it is the version written by this UPDATE.
+        UPDATE ... RETURNING isn't used, because Query.update can't return rows.
+        """
+        column, key = self._get_pk()
+        qs = self.data.filter(column == id)
+        data = self._get_column_values(data)
+
+        if data:
+            # update queries can't be ordered
+            qs.order_by(False).update(data, synchronize_session=False)
+
+        # instance can be already loaded to session (for example by validators)
+        item = qs.populate_existing().first()
+        if item is None:
+            raise NotFound("Object with id={} not found".format(id))
+
+        if data:
+            session = self.data.session
+
+            if unit_of_work.is_active():
+                unit_of_work.commit(session)
+            else:
+                # instance is detached while committing, so its read values aren't expired and reloaded
+                session.expunge(item)
+                session.commit()
+                session.add(item)
+
+        return self.wrapperType(item)
+
+    def delete_one(self, id):
+        """
+        Deletes record with one DELETE query. If model has ORM delete cascades
+        or delete event listeners, instance is loaded and deleted by session, so they are applied.
+        """
+        column, key = self._get_pk()
+        session = self.data.session
+        id = _to_pk_value(column, id)
+
+        if _has_delete_hooks(sa.inspect(self._get_model())):
+            self.get(id).delete()
+            return
+
+        if not self.data.filter(column == id).order_by(False).delete(synchronize_session=False):
+            raise NotFound("Object with id={} not found".format(id))
+
+        instance = session.identity_map.get(identity_key(self._get_model(), id))
+        if instance is not None:
+            session.expunge(instance)
+
+        unit_of_work.commit(session)
+
+    def bulk_update(self, updates):
+        model = self._get_model()
+        column, key = self._get_pk()
+        session = self.data.session
+
+        updates = [(id, self._get_column_values(values)) for id, values in updates]
+        data = dict((str(id), values) for id, values in updates if values)
+        if not data:
+            return 0
+
+        # only records from this queryset can be updated
+        allowed = self.data.with_entities(column).filter(column.in_(
+            [id for id, values in updates if values]
+        ))
+
+        mappings = []
+        for (id, ) in allowed:
+            values = dict(data[str(id)])
+            values[key] = id
+            mappings.append(values)
+
+        session.bulk_update_mappings(model, mappings)
+
+        # bulk update doesn't change instances which are already loaded to session
+        for values in mappings:
+            instance = session.identity_map.get(identity_key(model, values[key]))
+            if instance is not None:
+                session.expire(instance)
+
+        unit_of_work.commit(session)
+
+        return len(mappings)
+
+    def bulk_delete(self, ids):
+        column, key = self._get_pk()
+        session = self.data.session
+
+        count = self.data.filter(column.in_(list(ids))).order_by(False).delete(synchronize_session=False)
+        unit_of_work.commit(session)
+
+        return count
+
     def filter_by(self, **filters):
-        f = []
+        return self._clone(self.data.filter(*self._get_clauses(filters)))
+
+    def filter_any(self, *filters):
+        return self._clone(self.data.filter(sa.or_(*[
+            sa.and_(*self._get_clauses(f))
+            for f in filters
+        ])))
 
+    def _get_clauses(self, filters):
+        "Returns list of SQLAlchemy clauses for Django style filters"
         model = self._get_model()
 
+        f = []
         for key, value in filters.items():
-            clause = "eq"
-            if "__" in key:
-                key, clause = key.split("__")
-
-            if clause == "eq":
-                f.append(getattr(model, key) == value)
-            elif clause == "ne":
-                f.append(getattr(model, key) == value)
-            else:
-                raise TypeError("Unknown clause {} for key {}".format(clause, key))
+            builder = self._clause_builders.get((model, key))
+            if builder is None:
+                builder = self._clause_builders[(model, key)] = _compile_sa_lookup(model, key)
+            f.append(builder(value))
 
-        return SqlAlchemyQuerySet(self.data.filter(*f), SqlAlchemyInstanceWrapper)
+        return f
 
     def _get_model(self):
         return self.data._primary_entity.entity_zero._identity_class
@@ -363,5 +1450,268 @@ class SqlAlchemyQuerySet(QuerysetWrapper):
             else:
                 l.append(getattr(model, col))
 
-        return SqlAlchemyQuerySet(self.data.order_by(*l), SqlAlchemyInstanceWrapper)
+        return self._clone(self.data.order_by(*l), ordering=ordering)
+
+    def only(self, *paths):
+        mapper = sa.inspect(self._get_model())
+
+        columns = set()
+        for path in paths:
+            name = path.split("__")[0]
+            if name in mapper.column_attrs:
+                columns.add(name)
+            elif name in mapper.relationships:
+                # local foreign key columns are needed to load relationship
+                for column in mapper.relationships[name].local_columns:
+                    columns.add(mapper.get_property_by_column(column).key)
+
+        if not columns:
+            return self
+
+        return self._clone(self.data.options(load_only(*columns)))
+
+    def stream(self, batch_size):
+        return self._clone(self.data.yield_per(batch_size))
+
+    def prefetch_related(self, *paths):
+        options = []
+
+        for path in paths:
+            model = self._get_model()
+            loader = None
+
+            for part in path.split("__"):
+                relationships = sa.inspect(model).relationships
+                if part not in relationships:
+                    break
+
+                attr = getattr(model, part)
+                loader = selectinload(attr) if loader is None else loader.selectinload(attr)
+                model = relationships[part].mapper.class_
+
+            if loader is not None:
+                options.append(loader)
+
+        if not options:
+            return self
+
+        return self._clone(self.data.options(*options))
+
+
+_SA_LOOKUPS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "in": lambda column, value: column.in_(value),
+    "nin": lambda column, value: sa.not_(column.in_(value)),
+    # values of text lookups can be numbers (for example from JSON filter)
+    "contains": lambda column, value: column.contains(six.text_type(value), autoescape=True),
+    "icontains": lambda column, value: sa.func.lower(column).contains(six.text_type(value).lower(), autoescape=True),
+    "startswith": lambda column, value: column.startswith(six.text_type(value), autoescape=True),
+    "isnull": lambda column, value: column.is_(None) if value else column.isnot(None),
+}
+
+
+def _compile_sa_lookup(model, key):
+    """
+    Compiles Django style filter key (for example ``author__name__icontains``)
+    to function which returns SQLAlchemy clause for passed value.
+
+    Related paths are compiled to EXISTS subqueries with ``has()`` for scalar
+    and ``any()`` for list relationships.
+    """
+    parts = key.split("__")
+
+    lookup = "eq"
+    if len(parts) > 1 and parts[-1] in _SA_LOOKUPS:
+        lookup = parts.pop()
+
+    relationships = []
+    current = model
+    for part in parts[:-1]:
+        mapper_relationships = sa.inspect(current).relationships
+        if part not in mapper_relationships:
+            raise TypeError("Unknown relationship {} for key {}".format(part, key))
+
+        relationships.append(getattr(current, part))
+        current = mapper_relationships[part].mapper.class_
+
+    name = parts[-1]
+    if name not in sa.inspect(current).column_attrs:
+        raise TypeError("Unknown clause {} for key {}".format(name, key))
+
+    column = getattr(current, name)
+    compare = _SA_LOOKUPS[lookup]
+
+    def build(value):
+        clause = compare(column, value)
+        for attr in reversed(relationships):
+            if attr.property.uselist:
+                clause = attr.any(clause)
+            else:
+                clause = attr.has(clause)
+        return clause
+
+    return build
+
+
+_MISSING = object()
+
+
+class CachedQuerySet(QuerysetWrapper):
+    """
+    Wrapper for other queryset, which caches its results (get_data, first, count
+    and estimated_count) in cache for ttl seconds.
+
+    Cached records are not shared: each read gets copies of them (see :meth:`InstanceWrapper.attach`).
+
+    Cache keys are built from model name, its current generation and
+    :meth:`QuerysetWrapper.get_cache_key` of wrapped queryset, so filtered, ordered,
+    sliced and projected querysets are cached separately. Write methods bump generation
+    of model (see :func:`flask_restframework.utils.cache.bump_generation`),
+    so stale results are never served after update through any queryset of the model.
+    If unit of work is active, generation is bumped again after commit
+    (see :func:`flask_restframework.utils.unit_of_work.on_commit`), so results read by
+    concurrent requests before commit aren't served either.
+
+    If wrapped queryset doesn't support cache keys, it is queried as usual.
+
+    Usage example::
+
+        >>> qs = CachedQuerySet(QuerysetWrapper.from_queryset(Model.objects.all()), LRUCache(), ttl=60)
+        >>> list(qs.filter_by(name="test").get_data())  # query to database
+        >>> list(qs.filter_by(name="test").get_data())  # from cache
+    """
+
+    def __init__(self, qs, cache, ttl, prefetch=()):
+        #type: (QuerysetWrapper, BaseCache, int, tuple)->None
+        super(CachedQuerySet, self).__init__(qs, qs.wrapperType)
+        self.cache = cache
+        self.ttl = ttl
+        self.prefetch = tuple(prefetch)   #paths passed to prefetch_related
+
+    @property
+    def ordering(self):
+        return self.data.ordering
+
+    @property
+    def supports_concurrent_queries(self):
+        return self.data.supports_concurrent_queries
+
+    def _wrap(self, qs, prefetch=None):
+        if prefetch is None:
+            prefetch = self.prefetch
+        return CachedQuerySet(qs, self.cache, self.ttl, prefetch)
+
+    def invalidate(self):
+        "Invalidates cached results of all querysets of the model (now and after commit of unit of work)"
+        model = self.data.get_model_key()
+        if model is not None:
+            bump_generation(self.cache, model)
+
+            if unit_of_work.is_active():
+                unit_of_work.on_commit(functools.partial(bump_generation, self.cache, model))
+
+    def _get_key(self, operation):
+        "Returns cache key of operation or None if results can't be cached"
+        model = self.data.get_model_key()
+        key = self.data.get_cache_key()
+
+        if model is None or key is None:
+            return None
+
+        return "query:{}:{}:{}:{}:{}:{}".format(
+            model, get_generation(self.cache, model), operation,
+            self.data.__class__.__name__, key, self.prefetch
+        )
+
+    def _cached(self, operation, getter):
+        key = self._get_key(operation)
+        if key is None:
+            return getter()
+
+        value = self.cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = getter()
+            self.cache.set(key, value, ttl=self.ttl)
+
+        return value
+
+    def get_data(self):
+        for item in self._cached("data", lambda: list(self.data.get_data())):
+            yield item.attach()
+
+    def first(self):
+        item = self._cached("first", self.data.first)
+        if isinstance(item, InstanceWrapper):
+            return item.attach()
+        # some querysets return not wrapped items
+        return copy.deepcopy(item)
+
+    def count(self):
+        return self._cached("count", self.data.count)
+
+    def estimated_count(self):
+        return self._cached("estimated_count", self.data.estimated_count)
+
+    def get(self, id):
+        return self.data.get(id)
+
+    def get_filter_key(self):
+        return self.data.get_filter_key()
+
+    def get_model_key(self):
+        return self.data.get_model_key()
+
+    def get_cache_key(self):
+        return self.data.get_cache_key()
+
+    def slice(self, frm, to):
+        return self._wrap(self.data.slice(frm, to))
+
+    def filter_by(self, **filters):
+        return self._wrap(self.data.filter_by(**filters))
+
+    def filter_any(self, *filters):
+        return self._wrap(self.data.filter_any(*filters))
+
+    def filter_raw(self, spec):
+        return self._wrap(self.data.filter_raw(spec))
+
+    def order_by(self, *ordering):
+        return self._wrap(self.data.order_by(*ordering))
+
+    def only(self, *paths):
+        return self._wrap(self.data.only(*paths))
+
+    def as_raw(self):
+        return self._wrap(self.data.as_raw())
+
+    def prefetch_related(self, *paths):
+        return self._wrap(self.data.prefetch_related(*paths), self.prefetch + tuple(paths))
+
+    def stream(self, batch_size):
+        # streamed querysets are too big for cache
+        return self.data.stream(batch_size)
+
+    def update_one(self, id, data):
+        instance = self.data.update_one(id, data)
+        self.invalidate()
+        return instance
+
+    def delete_one(self, id):
+        self.data.delete_one(id)
+        self.invalidate()
+
+    def bulk_update(self, updates):
+        count = self.data.bulk_update(updates)
+        self.invalidate()
+        return count
 
+    def bulk_delete(self, ids):
+        count = self.data.bulk_delete(ids)
+        self.invalidate()
+        return count
@@ -56,6 +56,10 @@ class BaseResource(object):
 
     authentication_backends = None   #list of authentication backends
 
+    response_cache_ttl = None   #seconds to cache GET responses for (see middlewares.ResponseCacheMiddleware)
+    response_cache_vary_headers = ("Authorization", "Cookie")    #request headers which are part of response cache key
+    response_cache_vary_args = None     #query args which are part of response cache key, all args if None
+
     def __init__(self, request, ):
         self.request = request
 
@@ -105,9 +109,18 @@ class BaseResource(object):
         if cls.authentication_backends:
             view_func = auth_backends(*cls.authentication_backends)(view_func)
 
+        view_func.resource_class = cls
+
         return view_func
 
 
+    @classmethod
+    def invalidate_response_cache(cls):
+        "Invalidates cached responses of resource (see middlewares.ResponseCacheMiddleware)"
+        if cls.response_cache_ttl is not None:
+            from flask_restframework.middlewares import ResponseCacheMiddleware
+            ResponseCacheMiddleware.invalidate(cls)
+
     def dispatch_request(self, suffix="", **params):
         return self._dispatch(request, request.method.lower() + suffix, params)
 
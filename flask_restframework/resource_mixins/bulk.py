@@ -0,0 +1,90 @@
+from flask import jsonify
+
+from flask_restframework.model_resource import GenericResource
+from flask_restframework.queryset_wrapper import SnapshotInstanceWrapper
+
+
+class BulkUpdateMixin:
+    """
+    Allows to partially update many objects in one request.
+    Example usage::
+
+        >>> class SomeResource(BulkUpdateMixin,
+        >>>                    ModelResource):
+        >>>     serializer_class = SomeSerializer
+        >>>
+        >>>     def get_queryset(self):
+        >>>         return SomeModel.objects.all()
+
+    Then you can make requests::
+
+        PATCH <resource base url>
+        [{"id": "<id1>", "field": "value"}, {"id": "<id2>", "field": "other value"}]
+
+    All objects are loaded with one query and validated before updating, then changes are
+    written with one bulk query (see :meth:`flask_restframework.queryset_wrapper.QuerysetWrapper.bulk_update`).
+    On validation errors response is 400 with dict {item index: errors} and nothing is updated.
+    Response is list of updated objects. after_update is called for each object
+    with snapshot of old values (see :class:`flask_restframework.queryset_wrapper.SnapshotInstanceWrapper`).
+
+    Bulk create is done by POST of list to the resource (see CreateMixin),
+    bulk delete by :class:`flask_restframework.model_mixins.DeleteManyMixin`.
+    """
+
+    def patch(self, request):
+        assert isinstance(self, GenericResource)
+
+        data = self.get_data(request)
+        qs = self.get_adaptated_queryset()
+
+        ids = [item.get("id") if isinstance(item, dict) else None for item in data or []]
+        instances = dict(
+            (str(instance.get_id()), instance)
+            for instance in qs.filter_by(id__in=[id for id in ids if id is not None]).get_data()
+        )
+
+        serializers, errors = self.validate_many(
+            data, part=True, instances=[instances.get(str(id)) for id in ids]
+        )
+
+        for index, id in enumerate(ids):
+            if str(id) not in instances:
+                errors.setdefault(str(index), {})["id"] = ["Object not found"]
+
+        if errors:
+            out = jsonify(errors)
+            out.status_code = 400
+            return out
+
+        updates = []
+        old_values = {}
+        for item, serializer in zip(data, serializers):
+            validated_data = dict(
+                (key, value)
+                for key, value in serializer.cleaned_data.items()
+                if key in item and key != "id"
+            )
+            updates.append((item["id"], validated_data))
+
+            instance = instances[str(item["id"])]
+            old_values[str(item["id"])] = dict(
+                (key, instance.get_field(key))
+                for key in validated_data
+            )
+
+        qs.bulk_update(updates)
+        self.invalidate_cache([id for id, _ in updates])
+
+        updated = dict(
+            (str(instance.get_id()), instance)
+            for instance in qs.filter_by(id__in=[id for id, _ in updates]).get_data()
+        )
+
+        out = []
+        for id, validated_data in updates:
+            instance = updated[str(id)]
+            instance.old_values = old_values[str(id)]
+            self.after_update(SnapshotInstanceWrapper(instance), instance, validated_data)
+            out.append(self.serializer_class(instance).serialize())
+
+        return jsonify(out)
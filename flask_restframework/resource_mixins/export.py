@@ -0,0 +1,102 @@
+import csv
+import io
+
+import six
+from flask import jsonify, json
+from flask.helpers import stream_with_context
+from flask.wrappers import Response
+
+from flask_restframework.decorators import list_route
+
+
+class ExportMixin:
+    """
+    Allows to export all objects of resource as NDJSON or CSV.
+    Example usage::
+
+        >>> class SomeResource(ExportMixin,
+        >>>                    ModelResource):
+        >>>     serializer_class = SomeSerializer
+        >>>
+        >>>     def get_queryset(self):
+        >>>         return SomeModel.objects.all()
+
+    Then you can make requests::
+
+        GET <resource base url>/export?_format=ndjson
+        GET <resource base url>/export?_format=csv
+
+    Objects are filtered with usual backend filters (so format argument starts with underscore)
+    and serialized with serializer_class.
+    Response is streamed: queryset is fetched from database by batches of export_batch_size
+    records (see :meth:`flask_restframework.queryset_wrapper.QuerysetWrapper.stream`),
+    so memory doesn't depend on count of exported objects and there are no deep skips.
+
+    In CSV columns are keys of the first object, nested values are encoded as JSON.
+    """
+    export_batch_size = 1000
+
+    EXPORT_MIMETYPES = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    @list_route(methods=["GET"])
+    def export(self, request):
+        format = request.args.get("_format", "ndjson")
+
+        if format not in self.EXPORT_MIMETYPES:
+            out = jsonify({"_format": ["Unknown format {}".format(format)]})
+            out.status_code = 400
+            return out
+
+        qs = self.get_adaptated_queryset()
+        qs = self.filter_qs(qs)
+        qs = self.project_qs(qs)
+
+        if self.is_raw_list():
+            qs = qs.as_raw()
+
+        items = self.serializer_class(qs.stream(self.export_batch_size)).iter_serialize()
+
+        if format == "csv":
+            lines = _iter_csv(items)
+        else:
+            lines = (json.dumps(item) + "\n" for item in items)
+
+        return Response(stream_with_context(lines), mimetype=self.EXPORT_MIMETYPES[format])
+
+
+def _iter_csv(items):
+    "Encodes serialized items to CSV lines"
+    columns = None
+
+    for item in items:
+        if columns is None:
+            columns = list(item.keys())
+            yield _csv_line(columns)
+
+        yield _csv_line([_csv_value(item.get(key)) for key in columns])
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _csv_line(values):
+    if six.PY2:
+        # python 2 csv module works only with bytes
+        out = io.BytesIO()
+        csv.writer(out).writerow([
+            value.encode("utf-8") if isinstance(value, six.text_type) else value
+            for value in values
+        ])
+        return out.getvalue()
+
+    out = six.StringIO()
+    csv.writer(out).writerow(values)
+    return out.getvalue()
@@ -0,0 +1,131 @@
+import six
+from flask import json
+from flask.helpers import stream_with_context
+from flask.wrappers import Response
+
+from flask_restframework.decorators import list_route
+from flask_restframework.utils import unit_of_work
+
+
+class ImportMixin:
+    """
+    Allows to create many objects from NDJSON stream (one JSON object per line).
+    Example usage::
+
+        >>> class SomeResource(ImportMixin,
+        >>>                    ModelResource):
+        >>>     serializer_class = SomeSerializer
+        >>>
+        >>>     def get_queryset(self):
+        >>>         return SomeModel.objects.all()
+
+    Then you can make requests::
+
+        POST <resource base url>/import
+        {"field": "value1"}
+        {"field": "value2"}
+
+    Request body is read line by line, lines are validated with serializer_class by batches
+    of import_batch_size lines and valid objects of batch are created with one bulk insert
+    (see :meth:`flask_restframework.serializer.model_serializer.ModelSerializer.bulk_create`).
+
+    Response is streamed, so memory doesn't grow with size of import. It is sent after the end of
+    request, so each batch is committed separately with its own unit of work
+    (see :mod:`flask_restframework.utils.unit_of_work`). Response is NDJSON with errors of invalid lines,
+    committed batches and summary in the last line::
+
+        {"line": 2, "errors": {"field": ["Field is required"]}}
+        {"batch": 1, "lines": [1, 2], "created": 1}
+        {"created": 1, "failed": 1, "batches": 1, "complete": true}
+
+    If batch can't be created, its error is returned and import stops, earlier batches stay committed::
+
+        {"batch": 2, "lines": [3, 4], "error": "..."}
+        {"created": 1, "failed": 1, "batches": 1, "complete": false}
+    """
+    import_batch_size = 1000
+
+    @list_route(methods=["POST"], url_path="import")
+    def import_data(self, request):
+        lines = self._iter_import(request.stream)
+        return Response(stream_with_context(lines), mimetype="application/x-ndjson")
+
+    def _iter_import(self, stream):
+        counts = {"created": 0, "failed": 0, "batches": 0, "complete": True}
+
+        batch = []
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                batch.append((number, line))
+
+            if len(batch) >= self.import_batch_size:
+                for out in self._import_batch(batch, counts):
+                    yield out
+                batch = []
+
+                if not counts["complete"]:
+                    break
+
+        if counts["complete"]:
+            for out in self._import_batch(batch, counts):
+                yield out
+
+        yield json.dumps(counts) + "\n"
+
+    def _import_batch(self, batch, counts):
+        """
+        Validates batch of (line number, line) and creates valid objects in one unit of work.
+        Yields errors of invalid lines and result of batch
+        """
+        serializers = []
+
+        for number, line in batch:
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = None
+
+            if isinstance(data, dict):
+                serializer = self.serializer_class(data)
+                errors = None if serializer.validate() else serializer.errors
+            else:
+                errors = {"_line": ["JSON object expected"]}
+
+            if errors:
+                counts["failed"] += 1
+                yield json.dumps({"line": number, "errors": errors}) + "\n"
+            else:
+                serializers.append(serializer)
+
+        if not serializers:
+            return
+
+        result = {"batch": counts["batches"] + 1, "lines": [batch[0][0], batch[-1][0]]}
+
+        # unit of work of request is already finished when response is streamed
+        own = not unit_of_work.is_active()
+        if own:
+            unit_of_work.begin()
+
+        try:
+            instances = serializers[0].bulk_create([s.cleaned_data for s in serializers])
+            self.invalidate_cache([instance.get_id() for instance in instances])
+
+            for instance, serializer in zip(instances, serializers):
+                self.after_create(instance, serializer.cleaned_data)
+
+            if own:
+                unit_of_work.end(commit=True)
+        except Exception as e:
+            if own:
+                unit_of_work.end(commit=False)
+
+            counts["complete"] = False
+            result["error"] = six.text_type(e)
+            yield json.dumps(result) + "\n"
+            return
+
+        counts["created"] += len(instances)
+        counts["batches"] += 1
+        result["created"] = len(instances)
+        yield json.dumps(result) + "\n"
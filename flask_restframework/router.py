@@ -52,6 +52,7 @@ class DefaultRouter(BaseRouter):
         def handler(*a, **k):
             return func(viewCls(request), request, *a, **k)
 
+        handler.resource_class = viewCls
         return handler
 
     def _iter_methods(self, viewCls, processed):
@@ -1,3 +1,5 @@
+import functools
+import operator
 from collections import OrderedDict
 import six as six
 from mongoengine.queryset.queryset import QuerySet
@@ -8,6 +10,7 @@ from flask_restframework.fields import BaseRelatedField
 from flask_restframework.fields import ForeignKeyField
 
 from flask_restframework.fields import BaseField
+from flask_restframework.utils.util import is_method_overridden
 from ..exceptions import ValidationError
 
 __author__ = 'stas'
@@ -37,7 +40,9 @@ class _BaseSerializerMetaClass(type):
 
     def __new__(cls, name, bases, attrs):
         attrs['_declared_fields'] = cls._get_declared_fields(name, bases, attrs)
-        return super(_BaseSerializerMetaClass, cls).__new__(cls, name, bases, attrs)
+        new_class = super(_BaseSerializerMetaClass, cls).__new__(cls, name, bases, attrs)
+        new_class._compile()
+        return new_class
 
 @six.add_metaclass(_BaseSerializerMetaClass)
 class BaseSerializer:
@@ -89,6 +94,17 @@ class BaseSerializer:
     """
 
     _declared_fields = None     #type: OrderedDict
+    _fields = None              #type: dict
+    _fk_fields = None           #type: dict
+    _serialization_plan = None  #type: tuple
+    _model_paths = None         #type: tuple
+    _prefetch_paths = None      #type: tuple
+    _compile_error = None       #type: str
+
+    #: methods which are replaced by compiled serialization plan, if one of them is overridden plan isn't used
+    _plan_hooks = ("get_fields", "get_fk_fields", "_serialize_item")
+
+    batch_size = 100    #count of items which are serialized together (see Field.to_json_many)
 
     def __init__(
             self, data, context=None
@@ -127,36 +143,176 @@ class BaseSerializer:
             context
         )
 
-    def get_fields(self):
+    @classmethod
+    def _compile(cls):
         """
-        returns mapping: <fieldName>: <Field>
+        Called once per class by metaclass.
+        Precomputes fields mapping, fk fields mapping and serialization plan:
+        immutable tuple of (<output key>, <accessor>, <encoder>, <batch encoder>), where
+        accessor is (InstanceWrapper)->value, encoder is Field.to_json and
+        batch encoder is Field.to_json_many
+
+        Incorrect Meta.fk_fields don't fail class definition,
+        error is raised on first serialization (see :meth:`_check_compiled`).
+        """
+        cls._fields = cls._compile_fields()
 
-        Returns:
+        try:
+            cls._fk_fields = cls._compile_fk_fields()
+        except ValueError as e:
+            cls._compile_error = str(e)
+            cls._fk_fields = cls._serialization_plan = cls._model_paths = cls._prefetch_paths = None
+            return
 
-            * Only fields declared in Meta.fields if present (+ class-defined fields)
-            * All fields, except Meta.excluded if present
-        """
+        cls._compile_error = None
 
-        output = {}
+        plan = []
+        for key, field in cls._fields.items():
+            assert isinstance(field, BaseField), field
+            plan.append((
+                key,
+                functools.partial(field.get_value_from_model_object, field=key),
+                field.to_json,
+                field.to_json_many
+            ))
+
+        for key, field in cls._fk_fields.items():
+            plan.append((
+                key,
+                operator.methodcaller("get_field", key),
+                field.to_json,
+                field.to_json_many
+            ))
+
+        cls._serialization_plan = tuple(plan)
+        cls._model_paths = cls._compile_model_paths()
+        cls._prefetch_paths = cls._compile_prefetch_paths()
 
-        if hasattr(self, "Meta"):
-            meta = self.Meta
+    @classmethod
+    def _compile_model_paths(cls):
+        paths = set(cls._fk_fields.keys())
+
+        for key, field in cls._fields.items():
+            path = field.get_model_path(key)
+            if path is None:
+                return None
+            paths.add(path)
+
+        return tuple(sorted(paths))
+
+    @classmethod
+    def _compile_prefetch_paths(cls):
+        paths = set()
+
+        related = list(cls._fk_fields.keys())
+        related.extend(
+            field.get_model_path(key)
+            for key, field in cls._fields.items()
+            if isinstance(field, BaseRelatedField)
+        )
+
+        for path in related:
+            if path and "__" in path:
+                paths.add(path.rsplit("__", 1)[0])
+
+        return tuple(sorted(paths))
 
+    @classmethod
+    def _compile_fields(cls):
+        meta = getattr(cls, "Meta", None)
+
+        if meta is not None:
             if hasattr(meta, "fields"):
                 return {
                     key: value
-                    for key, value in self._declared_fields.items()
+                    for key, value in cls._declared_fields.items()
                     if key in meta.fields
                 }
 
             if hasattr(meta, "excluded"):
                 return {
                     key:value
-                    for key, value in self._declared_fields.items()
+                    for key, value in cls._declared_fields.items()
                     if key not in meta.excluded
                 }
 
-        return self._declared_fields
+        return cls._declared_fields
+
+    @classmethod
+    def _compile_fk_fields(cls):
+        out = {}
+
+        meta = getattr(cls, "Meta", None)
+        for key in getattr(meta, "fk_fields", ()):
+            if "__" not in key:
+                raise ValueError("You should use Django __ notation for FK fields!")
+
+            mainFkField = key.split("__")[0]
+            if mainFkField not in cls._fields:
+                raise ValueError("Incorrect field: {}".format(mainFkField))
+
+            out[key] = cls._fields[mainFkField]
+
+        return out
+
+    @classmethod
+    def _check_compiled(cls):
+        "Raises error of serializer class definition (for example incorrect Meta.fk_fields)"
+        if cls._compile_error is not None:
+            raise ValueError(cls._compile_error)
+
+    @classmethod
+    def _uses_plan(cls):
+        """
+        Returns False if one of _plan_hooks (get_fields, get_fk_fields, _serialize_item) is overridden,
+        so items should be serialized one by one with them instead of compiled plan
+        """
+        return not any(
+            is_method_overridden(cls, BaseSerializer, name)
+            for name in cls._plan_hooks
+        )
+
+    @classmethod
+    def get_model_paths(cls):
+        """
+        Returns tuple of model paths (with __ notation, including Meta.fk_fields)
+        which are needed for serialization, or None if serializer needs whole
+        instances (for example it has MethodField).
+        """
+        if not cls._uses_plan():
+            return None
+
+        cls._check_compiled()
+        return cls._model_paths
+
+    @classmethod
+    def get_prefetch_paths(cls):
+        """
+        Returns tuple of relation paths which are read by fk fields
+        (Meta.fk_fields and related fields with __ notation).
+        They are passed to QuerysetWrapper.prefetch_related on serialization.
+        """
+        if is_method_overridden(cls, BaseSerializer, "get_fk_fields"):
+            # fk fields are known only for serializer instance
+            return ()
+
+        if cls._uses_plan():
+            cls._check_compiled()
+
+        return cls._prefetch_paths
+
+    def get_fields(self):
+        """
+        returns mapping: <fieldName>: <Field>
+
+        Returns:
+
+            * Only fields declared in Meta.fields if present (+ class-defined fields)
+            * All fields, except Meta.excluded if present
+
+        Mapping is computed once per serializer class, don't modify it.
+        """
+        return self._fields
 
     def to_python(self):
         """
@@ -187,17 +343,39 @@ class BaseSerializer:
         data = self._get_queryset() #type: QuerysetWrapper
 
         if isinstance(data, QuerysetWrapper):
-            output = [
-                self._serialize_item(item)
-                for item in data.get_data()
-            ]
+            output = list(self.iter_serialize())
         else:
             output = self._serialize_item(data)
 
         return output
 
+    def iter_serialize(self):
+        """
+        Same as :meth:`serialize`, but returns generator which serializes items
+        by batches of batch_size items.
+        Allows to stream big querysets without holding all serialized data in memory.
+        """
+        data = self._get_queryset() #type: QuerysetWrapper
+
+        if not isinstance(data, QuerysetWrapper):
+            yield self._serialize_item(data)
+            return
+
+        prefetch_paths = self.get_prefetch_paths()
+        if prefetch_paths:
+            data = data.prefetch_related(*prefetch_paths)
 
+        items = []
+        for item in data.get_data():
+            items.append(item)
 
+            if len(items) >= self.batch_size:
+                for out in self._serialize_items(items):
+                    yield out
+                items = []
+
+        for out in self._serialize_items(items):
+            yield out
 
     @property
     def cleaned_data(self):
@@ -311,21 +489,24 @@ class BaseSerializer:
         For use it in validation, use PrimaryKeyField
         <key in serializer>: <field instance>
         """
-        out = {}
+        if is_method_overridden(self, BaseSerializer, "get_fields"):
+            out = {}
+            fields = self.get_fields()
 
-        if hasattr(self, "Meta") and hasattr(self.Meta, "fk_fields"):
-            for key in self.Meta.fk_fields:
+            for key in getattr(getattr(self, "Meta", None), "fk_fields", ()):
                 if "__" not in key:
                     raise ValueError("You should use Django __ notation for FK fields!")
 
                 mainFkField = key.split("__")[0]
-                fields = self.get_fields()
-                if mainFkField not in self.get_fields():
+                if mainFkField not in fields:
                     raise ValueError("Incorrect field: {}".format(mainFkField))
 
                 out[key] = fields[mainFkField]
 
-        return out
+            return out
+
+        self._check_compiled()
+        return self._fk_fields
 
     def _allow_additional_fields(self):
         meta = getattr(self, "Meta", None)
@@ -359,21 +540,55 @@ class BaseSerializer:
         #type: (InstanceWrapper)->dict
         """
         Performs serialization for python representation of item.
-        Uses Field.
+        Runs compiled serialization plan (or get_fields and get_fk_fields if plan isn't used).
         """
         assert isinstance(item, InstanceWrapper)
 
-        out = {}
+        if not self._uses_plan():
+            out = {}
 
-        for key, value in self.get_fields().items():
-            assert isinstance(value, BaseField), value
+            for key, value in self.get_fields().items():
+                assert isinstance(value, BaseField), value
 
-            out[key] = value.to_json(value.get_value_from_model_object(item, key))
+                out[key] = value.to_json(value.get_value_from_model_object(item, key))
 
-        for key, value in self.get_fk_fields().items():
-            out[key] = value.to_json(item.get_field(key))
+            for key, value in self.get_fk_fields().items():
+                out[key] = value.to_json(item.get_field(key))
 
-        return out
+            return out
+
+        self._check_compiled()
+
+        return {
+            key: encode(access(item))
+            for key, access, encode, _ in self._serialization_plan
+        }
+
+    def _serialize_items(self, items):
+        #type: (list[InstanceWrapper])->list[dict]
+        """
+        Performs serialization of batch of items.
+        Each field encodes whole column of values at once, so related fields
+        (like ReferenceField) can resolve all values with one query.
+        If get_fields, get_fk_fields or _serialize_item are overridden, items are serialized one by one with them.
+        """
+        if not items:
+            return []
+
+        if not self._uses_plan():
+            return [self._serialize_item(item) for item in items]
+
+        self._check_compiled()
+
+        columns = [
+            (key, batch_encode([access(item) for item in items]))
+            for key, access, _, batch_encode in self._serialization_plan
+        ]
+
+        return [
+            {key: values[i] for key, values in columns}
+            for i in range(len(items))
+        ]
 
     def _get_writable_fields(self):
         """
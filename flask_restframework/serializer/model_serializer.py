@@ -79,6 +79,14 @@ class ModelSerializer(BaseSerializer):
         "Performs create instance. Returns wrapped model intance"
         return InstanceWrapper.from_instance(self.get_model().create(**validated_data))
 
+    def bulk_create(self, validated_data_list):
+        #type: (list[dict])->list[InstanceWrapper]
+        "Performs create of many instances at once. Returns list of wrapped instances"
+        return [
+            InstanceWrapper.from_instance(item)
+            for item in self.get_model().bulk_create(validated_data_list)
+        ]
+
     def update(self, instance, validated_data):
         #type: (InstanceWrapper, dict)->InstanceWrapper
         "Performs update for instance. Returns wrapped instance with updated fields"
@@ -0,0 +1,64 @@
+import mongoengine as m
+
+from flask_restframework.utils.cache import LRUCache, get_generation, bump_generation, estimate_size
+
+
+class SizedInner(m.EmbeddedDocument):
+    value = m.StringField()
+
+
+class SizedDoc(m.Document):
+    value = m.StringField()
+    inner = m.EmbeddedDocumentField(SizedInner)
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # b is least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.set("d", 4, ttl=-1)
+    assert cache.get("d") is None
+
+
+def test_lru_cache_max_bytes():
+    cache = LRUCache(max_bytes=1000)
+
+    cache.set("a", "a" * 400)
+    cache.set("b", "b" * 400)
+    cache.set("c", "c" * 400)
+    assert cache.get("a") is None
+    assert cache.get("b") and cache.get("c")
+    assert cache.size <= 1000
+
+    # too big values aren't cached
+    cache.set("d", "d" * 2000)
+    assert cache.get("d") is None
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_generation():
+    cache = LRUCache()
+
+    generation = get_generation(cache, "model")
+    assert get_generation(cache, "model") == generation
+
+    bump_generation(cache, "model")
+    assert get_generation(cache, "model") != generation
+
+
+def test_estimate_size_of_document():
+    doc = SizedDoc(value="a" * 1000, inner=SizedInner(value="b" * 1000))
+
+    # field values of documents are counted
+    assert estimate_size(doc) > 2000
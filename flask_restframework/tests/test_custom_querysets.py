@@ -1,16 +1,22 @@
 import json
 
-from flask_restframework.queryset_wrapper import QuerysetWrapper
+from flask_restframework.exceptions import NotFound
+from flask_restframework.queryset_wrapper import QuerysetWrapper, SnapshotInstanceWrapper, CachedQuerySet
 from flask_restframework.tests.compat import mock
 
 import mongoengine as m
 import pytest
+from flask import request
+from pymongo.collection import Collection
+from pymongo.database import Database
 
 from flask_restframework.model_cursor_resource import GenericCursorResource
 from flask_restframework.model_resource import ModelResource
+from flask_restframework.model_wrapper import BaseModelWrapper
 from flask_restframework.serializer.base_serializer import BaseSerializer
 from flask_restframework import fields
 from flask_restframework.serializer.model_serializer import ModelSerializer
+from flask_restframework.utils.cache import LRUCache
 
 
 class Inner(m.EmbeddedDocument):
@@ -28,6 +34,17 @@ class Doc(m.Document):
     value = m.StringField()
 
 
+class Short(m.Document):
+    value = m.StringField(max_length=3)
+
+
+class Cleaned(m.Document):
+    value = m.StringField()
+
+    def clean(self):
+        self.value = self.value.upper()
+
+
 @pytest.fixture
 def complex_doc(db):
     return Doc.objects.create(
@@ -62,15 +79,13 @@ class Resource(ModelResource):
 
 @pytest.mark.test_fetch_data_with_cursor
 def test_fetch_data_with_cursor(app, complex_doc):
-    request = mock.Mock()
-
-    with app.test_request_context():
+    with app.test_request_context("/"):
         resp = Resource(request).get(request)
 
-    # data = json.loads(resp.data.decode("utf-8"))
-    assert resp.json[0]["inner_list"] == [{'value': '4'}, {'value': '5'}]
-    assert len(resp.json[0]["ref_list"]) == 2
-    assert resp.json[0]["inner"] == {"value": "3"}
+    data = json.loads(resp.data.decode("utf-8"))
+    assert data[0]["inner_list"] == [{'value': '4'}, {'value': '5'}]
+    assert len(data[0]["ref_list"]) == 2
+    assert data[0]["inner"] == {"value": "3"}
 
 
 
@@ -117,6 +132,43 @@ def test_join_data(app, complex_doc):
     }
 
 
+@pytest.mark.test_join_data
+def test_join_data_without_dereference(app, db):
+    refs = [Ref.objects.create(value=str(i)) for i in range(5)]
+    for ref in refs:
+        Doc.objects.create(ref=ref, ref_list=refs[:2])
+
+    class Nested(BaseSerializer):
+        value = fields.StringField()
+
+    class S(ModelSerializer):
+        ref = fields.ReferenceField(Nested, queryset=Ref.objects.all)
+        ref_list = fields.ListField(fields.ReferenceField(Nested, queryset=Ref.objects.all))
+
+        class Meta:
+            model = Doc
+            fields = ("ref", "ref_list")
+
+    ref_collection = Ref._get_collection_name()
+    queries = []
+    find = Collection.find
+
+    def counting_find(collection, *a, **k):
+        if collection.name == ref_collection:
+            queries.append(a)
+        return find(collection, *a, **k)
+
+    with mock.patch.object(Database, "dereference") as dereference, \
+            mock.patch.object(Collection, "find", autospec=True, side_effect=counting_find):
+        data = S(QuerysetWrapper.from_queryset(Doc.objects.all())).serialize()
+
+    # references aren't dereferenced for each document, one id__in query per field
+    assert not dereference.called
+    assert len(queries) == 2
+    assert [item["ref"] for item in data] == [{"value": str(i)} for i in range(5)]
+    assert data[0]["ref_list"] == [{"value": "0"}, {"value": "1"}]
+
+
 @pytest.mark.test_serialize_embedded
 def test_serialize_embedded(app, complex_doc):
     class S(ModelSerializer):
@@ -129,3 +181,161 @@ def test_serialize_embedded(app, complex_doc):
         "field": "3"
     }]
 
+
+
+@pytest.mark.test_projection
+def test_projection(app, complex_doc):
+    class S(ModelSerializer):
+        field = fields.ForeignKeyField("inner__value")
+        class Meta:
+            model = Doc
+            fields = ("value", "field", "ref")
+            fk_fields = ("ref__value", )
+
+    assert S.get_model_paths() == ("inner__value", "ref", "ref__value", "value")
+
+    qs = QuerysetWrapper.from_queryset(Doc.objects.all()).only(*S.get_model_paths())
+    assert qs.data._loaded_fields.as_dict() == {"inner": 1, "ref": 1, "value": 1}
+    assert S(qs).serialize() == [{
+        "value": None, "field": "3", "ref": str(complex_doc.ref.id), "ref__value": "1"
+    }]
+
+    # path which isn't document field (for example property) disables projection
+    qs = QuerysetWrapper.from_queryset(Doc.objects.all()).only("value", "some_property")
+    assert qs.data._loaded_fields.as_dict() == {}
+
+
+@pytest.mark.test_raw_list
+def test_raw_list(app, complex_doc):
+    class S(ModelSerializer):
+        class Meta:
+            model = Doc
+            fk_fields = ("inner__value", )
+
+    class R(ModelResource):
+        serializer_class = S
+
+        def get_queryset(self):
+            return Doc.objects.all()
+
+    class RawR(R):
+        raw_list = True
+
+    with app.test_request_context("/"):
+        expected = json.loads(R(request).get(request).data.decode("utf-8"))
+        data = json.loads(RawR(request).get(request).data.decode("utf-8"))
+
+    assert data == expected
+    assert data[0]["inner__value"] == "3"
+
+
+@pytest.mark.test_raw_list
+def test_raw_list_with_reference(app, complex_doc):
+    class S(ModelSerializer):
+        class Meta:
+            model = Doc
+            fk_fields = ("ref__value", "inner__value")
+
+    qs = QuerysetWrapper.from_queryset(Doc.objects.all())
+
+    # references can't be read from raw records, documents are serialized instead
+    assert S(qs.as_raw()).serialize() == S(qs).serialize()
+    assert S(qs.as_raw()).serialize()[0]["ref__value"] == "1"
+
+    item = next(iter(qs.as_raw().get_data()))
+    assert item.get_field("inner__value") == "3"
+    with pytest.raises(ValueError):
+        item.get_field("ref__value")
+
+
+@pytest.mark.test_lazy_cursor
+def test_lazy_cursor(app, complex_doc):
+    Doc.objects.create(value="2")
+    Doc.objects.create(value="3")
+
+    qs = QuerysetWrapper.from_queryset(Doc._get_collection().find())
+
+    assert qs.count() == 3
+    assert qs.filter_by(value__in=["2", "3"]).count() == 2
+    assert qs.get(str(complex_doc.id)).get_id() == complex_doc.id
+
+    page = qs.order_by("-value").slice(1, 3)
+    assert page.count() == 2
+    assert [item.get_field("value") for item in page.get_data()] == ["2", None]
+    # queryset isn't consumed by iteration
+    assert [item.get_field("value") for item in page.get_data()] == ["2", None]
+
+    assert qs.filter_by(id__in=[str(complex_doc.id)]).first().get_id() == complex_doc.id
+    assert qs.slice(3, 3).count() == 0
+
+
+@pytest.mark.test_update_one
+def test_update_one(app, db):
+    short = Short.objects.create(value="1")
+    qs = QuerysetWrapper.from_queryset(Short.objects.all())
+
+    assert qs.update_one(str(short.id), {"value": "2"}).get_field("value") == "2"
+
+    # atomic update validates values like save() does
+    with pytest.raises(m.ValidationError):
+        qs.update_one(str(short.id), {"value": "long"})
+    assert Short.objects.get(id=short.id).value == "2"
+
+    # document with clean() is loaded and saved
+    cleaned = Cleaned.objects.create(value="a")
+    qs = QuerysetWrapper.from_queryset(Cleaned.objects.all())
+
+    assert qs.update_one(str(cleaned.id), {"value": "b"}).get_field("value") == "B"
+    assert Cleaned.objects.get(id=cleaned.id).value == "B"
+
+    with pytest.raises(NotFound):
+        qs.update_one(str(short.id), {"value": "c"})
+
+
+@pytest.mark.test_bulk_create
+def test_bulk_create(app, db):
+    wrapper = BaseModelWrapper.fromModel(Short)
+
+    assert [doc.value for doc in wrapper.bulk_create([{"value": "1"}, {"value": "2"}])] == ["1", "2"]
+
+    # documents are validated before insert
+    with pytest.raises(m.ValidationError):
+        wrapper.bulk_create([{"value": "3"}, {"value": "long"}])
+    assert sorted(Short.objects.values_list("value")) == ["1", "2"]
+
+    # document with clean() is saved
+    docs = BaseModelWrapper.fromModel(Cleaned).bulk_create([{"value": "a"}, {"value": "b"}])
+    assert [doc.value for doc in docs] == ["A", "B"]
+    assert sorted(Cleaned.objects.values_list("value")) == ["A", "B"]
+
+
+@pytest.mark.test_cached_queryset
+def test_cached_documents_are_copied(app, complex_doc):
+    qs = CachedQuerySet(QuerysetWrapper.from_queryset(Doc.objects.all()), LRUCache(), 60)
+
+    item = next(iter(qs.get_data()))
+    item.item.inner.value = "changed"
+    item.item.value = "changed"
+
+    # documents of cache aren't changed by other requests
+    for cached in [next(iter(qs.get_data())), next(iter(qs.as_raw().get_data()))]:
+        assert cached.get_field("inner__value") == "3"
+        assert cached.get_field("value") is None
+
+    assert next(iter(qs.get_data())).item is not next(iter(qs.get_data())).item
+
+    qs.first().value = "changed"
+    assert qs.first().value is None
+
+
+def test_snapshot_item(app, db):
+    short = Short.objects.create(value="1")
+    instance = QuerysetWrapper.from_queryset(Short.objects.all()).get(short.id)
+
+    instance.update({"value": "2"})
+    snapshot = SnapshotInstanceWrapper(instance)
+
+    assert snapshot.item.value == "1"
+    assert snapshot.item.id == short.id
+    assert instance.item.value == "2"
+    assert Short.objects.get(id=short.id).value == "2"
@@ -4,7 +4,8 @@ import pytest
 from mongoengine.queryset.queryset import QuerySet
 
 from flask_restframework.filter_backends import JsonFilterBackend, OrderingBackend
-from flask_restframework.queryset_wrapper import MongoDbQuerySet
+from flask_restframework.queryset_wrapper import MongoDbQuerySet, CachedQuerySet
+from flask_restframework.utils.cache import LRUCache
 import mongoengine as m
 
 from flask_restframework.tests.compat import mock
@@ -14,6 +15,10 @@ class Doc(m.Document):
     pass
 
 
+class ValueDoc(m.Document):
+    value = m.StringField()
+
+
 @mock.patch.object(QuerySet, "filter")
 def test_json_filter_backend(m, db):
     qs = Doc.objects.all()
@@ -35,6 +40,25 @@ def test_json_filter_backend(m, db):
         mock.call(__raw__=dict(key="value"))
     ])
 
+@pytest.mark.test_json_filter_backend
+def test_json_filter_backend_with_cached_queryset(app, db):
+    ValueDoc.objects.create(value="1")
+    ValueDoc.objects.create(value="2")
+
+    jf = JsonFilterBackend(
+        CachedQuerySet(MongoDbQuerySet.from_queryset(ValueDoc.objects.all()), LRUCache(), 60),
+        mock.Mock(
+            args=dict(json_filters=json.dumps(dict(value="2")))
+        ), mock.Mock(
+            spec=[]
+        )
+    )
+
+    qs = jf.filter()
+
+    assert isinstance(qs, CachedQuerySet)
+    assert [item.get_field("value") for item in qs.get_data()] == ["2"]
+
 @pytest.mark.test_json_filter_backend
 @mock.patch.object(QuerySet, "order_by")
 def test_ordering_backend(m, db):
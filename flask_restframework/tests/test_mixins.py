@@ -1,5 +1,6 @@
 import pytest
 
+from flask_restframework.exceptions import NotFound
 from flask_restframework.model_resource import ModelResource
 from flask_restframework.serializer.model_serializer import ModelSerializer
 import mongoengine as m
@@ -34,3 +35,7 @@ def test_delete_mixin(simple_model):
     resp = R(request).delete_object(request, simple_model.id)
     assert resp.status_code == 200
     assert resp.json == {"id": str(simple_model.id)}
+    assert SimpleModel.objects.count() == 0
+
+    with pytest.raises(NotFound):
+        R(request).delete_object(request, simple_model.id)
@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+from flask.app import Flask
+
+from flask_restframework.pagination import DefaultPagination, COUNT_CACHED
+from flask_restframework.queryset_wrapper import QuerysetWrapper, CursorInstanceWrapper
+from flask_restframework.tests.compat import mock
+
+
+class ListQuerySet(QuerysetWrapper):
+    supports_concurrent_queries = True
+
+    def count(self):
+        self.count_thread = threading.current_thread()
+        return len(self.data)
+
+    def slice(self, frm, to):
+        return ListQuerySet(self.data[frm:to], self.wrapperType)
+
+    def get_filter_key(self):
+        return "all"
+
+    def get_model_key(self):
+        return "list{}".format(len(self.data))
+
+
+@pytest.mark.test_concurrent_count
+def test_concurrent_count(app):
+    qs = ListQuerySet([{"_id": i} for i in range(25)], CursorInstanceWrapper)
+
+    class Pagination(DefaultPagination):
+        concurrent_count = True
+
+    pagination = Pagination(qs)
+    pagination.paginate(mock.Mock(args={"page": 3}))
+
+    assert [item.get_id() for item in pagination.qs.get_data()] == list(range(20, 25))
+    assert pagination.update_response([]) == {
+        "results": [], "total": 25, "pages": 3, "page": 3, "page_size": 10
+    }
+    assert qs.count_thread is not threading.current_thread()
+
+    pagination = DefaultPagination(qs)
+    assert pagination.total == 25
+    assert qs.count_thread is threading.current_thread()
+
+
+@pytest.mark.test_pagination_state_per_app
+def test_pagination_state_per_app(app):
+    app.config["FLASK_REST"] = {"PAGINATION_COUNT_MODE": COUNT_CACHED, "PAGINATION_THREADS": 2}
+
+    other = Flask(__name__)
+    other.config["FLASK_REST"] = {"PAGINATION_COUNT_MODE": COUNT_CACHED, "PAGINATION_THREADS": 1}
+
+    class Pagination(DefaultPagination):
+        concurrent_count = True
+
+    qs = ListQuerySet([{"_id": i} for i in range(25)], CursorInstanceWrapper)
+    pagination = Pagination(qs)
+    assert pagination.total == 25
+    executor = pagination._state.executor
+    assert executor._max_workers == 2
+    assert Pagination(qs)._state.executor is executor
+
+    # counts of other model with the same filter aren't taken from cache
+    assert Pagination(ListQuerySet([{"_id": 1}], CursorInstanceWrapper)).total == 1
+    assert Pagination(qs).total == 25
+
+    with other.app_context():
+        pagination = Pagination(ListQuerySet([{"_id": 1}] * 25, CursorInstanceWrapper))
+        assert pagination.total == 25
+        assert pagination._state.executor._max_workers == 1
+        assert pagination.get_count_cache() is not app.extensions["flask_restframework.pagination"].count_cache
+
+    assert len(app.extensions["flask_restframework.pagination"].count_cache._data) == 2
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from flask_restframework.utils.singleflight import SingleFlight
+
+
+def _run_concurrently(count, func):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(func()))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_singleflight():
+    flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return len(calls)
+
+    results = _run_concurrently(5, lambda: flight.do("key", compute))
+
+    assert len(calls) == 1
+    assert results == [1] * 5
+
+    # finished calls aren't cached
+    assert flight.do("key", compute) == 2
+
+
+def test_singleflight_error():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError("fail")
+
+    def call():
+        try:
+            flight.do("key", fail)
+        except ValueError as e:
+            return str(e)
+
+    assert _run_concurrently(3, call) == ["fail"] * 3
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
@@ -1,11 +1,34 @@
+import contextlib
 import datetime
+import json
+import threading
+import time
 
 import pytest
+from flask import request
 from flask.ext.sqlalchemy import SQLAlchemy
 import sqlalchemy as sa
 
+from flask_restframework import RestFramework, fields
+from flask_restframework.exceptions import NotFound, ValidationError
+from flask_restframework.authentication_backend import BaseAuthenticationBackend
+from flask_restframework.middlewares import AuthenticationMiddleware, UnitOfWorkMiddleware, ResponseCacheMiddleware
+from flask_restframework.model_mixins import DeleteManyMixin
+from flask_restframework.model_resource import ModelResource
 from flask_restframework.model_wrapper import SqlAlchemyModelWrapper
+from flask_restframework.filter_backends import DefaultFilterBackend, OrderingBackend
+from flask_restframework.pagination import DefaultPagination, KeysetPagination
+from flask_restframework.queryset_wrapper import QuerysetWrapper, CachedQuerySet, SqlAlchemyQuerySet
+from flask_restframework.resource import BaseResource
+from flask_restframework.resource_mixins.bulk import BulkUpdateMixin
+from flask_restframework.resource_mixins.export import ExportMixin
+from flask_restframework.resource_mixins.import_data import ImportMixin
+from flask_restframework.router import DefaultRouter
+from flask_restframework.serializer.base_serializer import BaseSerializer
 from flask_restframework.serializer.model_serializer import ModelSerializer
+from flask_restframework.tests.compat import mock
+from flask_restframework.utils import unit_of_work
+from flask_restframework.utils.cache import LRUCache, get_generation
 
 db = SQLAlchemy()
 
@@ -24,6 +47,47 @@ class SAModel(db.Model):
     )
 
 
+class SAAuthor(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(), nullable=False)
+    updated = db.Column(db.DateTime(), default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
+class SABook(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(), nullable=False)
+    author_id = db.Column(db.Integer, db.ForeignKey(SAAuthor.id), nullable=False)
+
+    author = db.relationship(SAAuthor, backref="books")
+
+
+class SAPost(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(), nullable=False)
+
+
+class SAComment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey(SAPost.id), nullable=False)
+
+    post = db.relationship(SAPost, backref=db.backref("comments", cascade="all, delete-orphan"))
+
+
+validated = []
+
+
+class SARenamed(db.Model):
+    __tablename__ = "sa_renamed"
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column("title", db.String(), nullable=False)
+
+    @sa.orm.validates("name")
+    def validate_name(self, key, value):
+        validated.append(value)
+        return value
+
+
 @pytest.fixture()
 def sdb(app):
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
@@ -140,3 +204,1310 @@ def test_model_serializer_creation(sdb):
     assert instance.dt == datetime.datetime(2016, 1, 1)
     assert instance.id == 1
 
+
+
+def test_serialization_plan_compiled_once(samodel):
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    assert [entry[0] for entry in Serializer._serialization_plan] == ["id", "uniq"]
+
+    with mock.patch.object(Serializer, "_compile_fields") as m:
+        data = Serializer.from_queryset(SAModel.query).serialize()
+
+    assert not m.called
+    assert data == [dict(id=1, uniq="uniq")]
+
+
+def test_serialization_plan_respects_overrides(samodel):
+    class FieldsSerializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+        def get_fields(self):
+            fields = super(FieldsSerializer, self).get_fields()
+            return {"uniq": fields["uniq"]}
+
+    class ItemSerializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+        def _serialize_item(self, item):
+            out = super(ItemSerializer, self)._serialize_item(item)
+            out["extra"] = True
+            return out
+
+    assert FieldsSerializer.from_queryset(SAModel.query).serialize() == [dict(uniq="uniq")]
+    assert FieldsSerializer.get_model_paths() is None
+    assert ItemSerializer.from_queryset(SAModel.query).serialize() == [dict(id=1, uniq="uniq", extra=True)]
+
+
+def test_incorrect_fk_fields_fail_on_serialization(samodel):
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+            fk_fields = ("author__name", )
+
+    with pytest.raises(ValueError) as e:
+        Serializer.from_queryset(SAModel.query).serialize()
+
+    assert "Incorrect field: author" in str(e.value)
+
+
+def test_serialization_plan_respects_fk_fields_override(sdb):
+    db.session.add(SABook(title="book", author=SAAuthor(name="author")))
+    db.session.commit()
+
+    class Serializer(ModelSerializer):
+        author = fields.ForeignKeyField("author__name")
+
+        class Meta:
+            model = SABook
+            fields = ("title", )
+            fk_fields = ("author__id", )
+
+        def get_fk_fields(self):
+            return {"author__name": self.get_fields()["author"]}
+
+    assert Serializer.get_model_paths() is None
+    assert Serializer.from_queryset(SABook.query).serialize() == [
+        {"title": "book", "author": "author", "author__name": "author"}
+    ]
+
+
+def test_stream_list(app, samodel):
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        stream_list = True
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+
+    resp = app.test_client().get("/test")
+    assert resp.is_streamed
+    assert json.loads(resp.data.decode("utf-8")) == [dict(id=1, uniq="uniq")]
+
+    Resource.pagination_class = DefaultPagination
+    resp = app.test_client().get("/test?page_size=5")
+    assert json.loads(resp.data.decode("utf-8")) == dict(
+        results=[dict(id=1, uniq="uniq")], total=1, pages=1, page=1, page_size=5
+    )
+
+
+def test_projection(app, samodel):
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    assert Serializer.get_model_paths() == ("id", "uniq")
+
+    qs = QuerysetWrapper.from_queryset(SAModel.query).only(*Serializer.get_model_paths())
+    db.session.expunge_all()
+    instance = next(qs.get_data()).item
+    assert sa.inspect(instance).unloaded == {"dt", "date", "boolean", "un1", "un2"}
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        use_projection = True
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+
+    resp = app.test_client().get("/test/1")
+    assert json.loads(resp.data.decode("utf-8")) == dict(id=1, uniq="uniq")
+
+
+def _add_samodels(count, start=0):
+    for i in range(start, start + count):
+        db.session.add(SAModel(
+            uniq="uniq{}".format(i),
+            boolean=True,
+            un1="un1",
+            un2="un2_{}".format(i)
+        ))
+    db.session.commit()
+
+
+@contextlib.contextmanager
+def _count_queries():
+    queries = []
+
+    def on_execute(conn, cursor, statement, *a):
+        queries.append(statement)
+
+    sa.event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        yield queries
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+
+def test_reference_field_is_resolved_with_one_query(samodel):
+    _add_samodels(3)
+
+    class Nested(BaseSerializer):
+        uniq = fields.StringField()
+
+    class Serializer(ModelSerializer):
+        id = fields.ReferenceField(Nested, queryset=SAModel.query)
+
+        class Meta:
+            model = SAModel
+            fields = ("id", )
+
+    with _count_queries() as queries:
+        data = Serializer.from_queryset(SAModel.query.order_by(SAModel.id)).serialize()
+
+    assert len(queries) == 2
+    assert data == [
+        {"id": {"uniq": "uniq"}},
+        {"id": {"uniq": "uniq0"}},
+        {"id": {"uniq": "uniq1"}},
+        {"id": {"uniq": "uniq2"}},
+    ]
+
+
+def test_prefetch_related_from_fk_fields(sdb):
+    for i in range(3):
+        db.session.add(SABook(title=str(i), author=SAAuthor(name="author{}".format(i))))
+    db.session.commit()
+    db.session.expunge_all()
+
+    class Serializer(ModelSerializer):
+        author = fields.ForeignKeyField("author__name")
+
+        class Meta:
+            model = SABook
+            fields = ("title", )
+            fk_fields = ("author__id", )
+
+    assert Serializer.get_prefetch_paths() == ("author", )
+
+    with _count_queries() as queries:
+        data = Serializer.from_queryset(SABook.query.order_by(SABook.id)).serialize()
+
+    assert len(queries) == 2
+    assert data == [
+        {"title": str(i), "author": "author{}".format(i), "author__id": i + 1}
+        for i in range(3)
+    ]
+
+
+def test_keyset_pagination(app, samodel):
+    _add_samodels(3)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", )
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        pagination_class = KeysetPagination
+        filter_backends = [OrderingBackend]
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    def get(url):
+        return json.loads(client.get(url).data.decode("utf-8"))
+
+    # equal un1 values are ordered by id
+    page = get("/test?ordering=un1&page_size=3")
+    assert page["results"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    page = get("/test?ordering=un1&page_size=3&_cursor=" + page["next_cursor"])
+    assert page["results"] == [{"id": 4}]
+    assert page["next_cursor"] is None
+
+    page = get("/test?ordering=-uniq&page_size=2")
+    assert page["results"] == [{"id": 4}, {"id": 3}]
+
+    page = get("/test?ordering=-uniq&page_size=2&_cursor=" + page["next_cursor"])
+    assert page["results"] == [{"id": 2}, {"id": 1}]
+    assert page["next_cursor"] is None
+
+    RestFramework(app)
+    resp = client.get("/test?_cursor=bad")
+    assert resp.status_code == 400
+
+
+@pytest.mark.test_keyset_pagination_with_filters
+def test_keyset_pagination_with_filters(app, samodel):
+    _add_samodels(4)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", )
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        pagination_class = KeysetPagination
+        filter_backends = [DefaultFilterBackend, OrderingBackend]
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    ids = []
+    url = "/test?un1=un1&ordering=-uniq&page_size=2"
+    while url:
+        with _count_queries() as queries:
+            resp = client.get(url)
+        assert resp.status_code == 200
+        # next cursor is taken from the fetched page
+        assert len(queries) == 1
+
+        page = json.loads(resp.data.decode("utf-8"))
+        ids.extend(item["id"] for item in page["results"])
+        url = page["next_cursor"] and "/test?un1=un1&ordering=-uniq&page_size=2&_cursor=" + page["next_cursor"]
+
+    assert ids == [5, 4, 3, 2, 1]
+
+
+def test_pagination_count_modes(app, samodel):
+    _add_samodels(3)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", )
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        pagination_class = DefaultPagination
+        filter_backends = [DefaultFilterBackend]
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    def get(url):
+        return json.loads(client.get(url).data.decode("utf-8"))
+
+    app.config["FLASK_REST"] = {"PAGINATION_COUNT_MODE": "none"}
+
+    with _count_queries() as queries:
+        page = get("/test?page_size=3")
+    assert len(queries) == 1
+    assert page == dict(results=[{"id": 1}, {"id": 2}, {"id": 3}], has_next=True, page=1, page_size=3)
+    assert get("/test?page_size=3&page=2")["has_next"] is False
+
+    Resource.stream_list = True
+    assert get("/test?page_size=3") == page
+    assert get("/test?page_size=3&page=2")["has_next"] is False
+    Resource.stream_list = False
+
+    app.config["FLASK_REST"] = {"PAGINATION_COUNT_MODE": "cached"}
+
+    assert get("/test?boolean=1")["total"] == 3
+    _add_samodels(1, start=3)
+    # count is cached by filter
+    assert get("/test?boolean=1")["total"] == 3
+    assert get("/test")["total"] == 5
+
+    app.config["FLASK_REST"] = {"PAGINATION_COUNT_MODE": "estimated"}
+    assert get("/test")["total"] == 5
+
+
+@pytest.mark.test_filter_lookups
+def test_filter_lookups(sdb):
+    _add_samodels(5)
+    SAModel.query.filter_by(uniq="uniq3").update({"un1": "Some_%"})
+    db.session.add_all([
+        SABook(title="first", author=SAAuthor(name="Leo")),
+        SABook(title="second", author=SAAuthor(name="Fedor")),
+    ])
+    db.session.commit()
+
+    qs = QuerysetWrapper.from_queryset(SAModel.query)
+
+    def uniqs(**filters):
+        return sorted(item.get_field("uniq") for item in qs.filter_by(**filters).get_data())
+
+    assert uniqs(uniq__ne="uniq0") == ["uniq1", "uniq2", "uniq3", "uniq4"]
+    assert uniqs(uniq__nin=["uniq0", "uniq1"], un2__lte="un2_3") == ["uniq2", "uniq3"]
+    assert uniqs(un1__contains="_%") == ["uniq3"]
+    assert uniqs(un1__icontains="SOME") == ["uniq3"]
+    assert uniqs(un1__startswith="Some") == ["uniq3"]
+    assert uniqs(uniq__icontains=3, un2__contains=3) == ["uniq3"]
+    assert uniqs(un1__isnull=True) == []
+
+    books = QuerysetWrapper.from_queryset(SABook.query)
+    assert [b.get_field("title") for b in books.filter_by(author__name__startswith="L").get_data()] == ["first"]
+
+    authors = QuerysetWrapper.from_queryset(SAAuthor.query)
+    assert [a.get_field("name") for a in authors.filter_by(books__title="second").get_data()] == ["Fedor"]
+
+    with pytest.raises(TypeError):
+        qs.filter_by(uniq__unknown=1)
+
+
+@pytest.mark.test_bulk_endpoints
+def test_bulk_endpoints(app, sdb):
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "boolean", "un1", "un2")
+
+    class Resource(BulkUpdateMixin, DeleteManyMixin, ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAModel.query.filter(SAModel.un1 != "hidden")
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    def send(method, data):
+        resp = client.open("/test", method=method, data=json.dumps(data), content_type="application/json")
+        return resp.status_code, json.loads(resp.data.decode("utf-8"))
+
+    items = [dict(uniq="uniq{}".format(i), boolean=True, un1="un1", un2=str(i)) for i in range(3)]
+
+    status, data = send("POST", items)
+    assert status == 200
+    assert [item["uniq"] for item in data] == ["uniq0", "uniq1", "uniq2"]
+    assert SAModel.query.count() == 3
+
+    status, data = send("POST", [dict(uniq="uniq3", boolean=True, un1="un1", un2="3"), dict(uniq="uniq4")])
+    assert status == 400
+    assert list(data.keys()) == ["1"]
+    assert SAModel.query.count() == 3
+
+    SAModel.query.filter_by(uniq="uniq2").update({"un1": "hidden"})
+    db.session.commit()
+
+    status, data = send("PATCH", [dict(id=2, un2="changed"), dict(id=1, boolean=False)])
+    assert status == 200
+    assert data == [
+        dict(id=2, uniq="uniq1", boolean=True, un1="un1", un2="changed"),
+        dict(id=1, uniq="uniq0", boolean=False, un1="un1", un2="0"),
+    ]
+
+    # objects outside of resource queryset can't be updated
+    status, data = send("PATCH", [dict(id=1, un2="x"), dict(id=3, un2="x")])
+    assert status == 400
+    assert data == {"1": {"id": ["Object not found"]}}
+    assert SAModel.query.get(1).un2 == "0"
+
+    status, data = send("DELETE", dict(ids=[1, 3]))
+    assert data == {"deleted": 1, "chunks": 1}
+    assert [item.id for item in SAModel.query.order_by(SAModel.id)] == [2, 3]
+
+
+def test_bulk_create_inserts_rows_with_one_statement(sdb):
+    items = [
+        dict(id=id, uniq="uniq{}".format(id), boolean=True, un1="un1", un2=str(id))
+        for id in (7, 5, 6)
+    ]
+
+    with _count_queries() as queries:
+        instances = SqlAlchemyModelWrapper(SAModel).bulk_create(items)
+
+    assert len([query for query in queries if query.startswith("INSERT")]) == 1
+    assert [instance.uniq for instance in instances] == ["uniq7", "uniq5", "uniq6"]
+    assert all(isinstance(instance.dt, datetime.datetime) for instance in instances)
+
+    # generated keys are set to instances of items
+    instances = SqlAlchemyModelWrapper(SAModel).bulk_create([
+        dict(uniq="a", boolean=True, un1="un1", un2="a"),
+        dict(uniq="b", boolean=True, un1="un1", un2="b", date=datetime.date(2017, 1, 1)),
+    ])
+    assert [(instance.id, instance.uniq) for instance in instances] == [(8, "a"), (9, "b")]
+    assert instances[1].date == datetime.date(2017, 1, 1)
+
+
+def test_bulk_create_uses_attribute_names(sdb):
+    instances = SqlAlchemyModelWrapper(SARenamed).bulk_create([dict(name="a"), dict(name="b")])
+
+    assert [(instance.id, instance.name) for instance in instances] == [(1, "a"), (2, "b")]
+    assert [item.name for item in SARenamed.query.order_by(SARenamed.id)] == ["a", "b"]
+    assert sdb.session.execute(sa.text("SELECT title FROM sa_renamed ORDER BY id")).fetchall() == [
+        ("a", ), ("b", )
+    ]
+    # instances are created by ORM, so @validates is applied
+    assert validated == ["a", "b"]
+
+
+@pytest.mark.test_atomic_patch
+def test_atomic_patch(app, sdb):
+    _add_samodels(2)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "un2")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAModel.query.filter(SAModel.un2 != "un2_1")
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    def patch(id, data):
+        return client.patch("/test/{}".format(id), data=json.dumps(data), content_type="application/json")
+
+    with _count_queries() as queries:
+        resp = patch(1, {"uniq": "uniq0", "un2": "changed"})
+
+    assert resp.status_code == 200
+    assert json.loads(resp.data.decode("utf-8")) == {"id": 1, "uniq": "uniq0", "un2": "changed"}
+    # instance isn't loaded before update: unique check, update and fetch of updated row
+    assert len(queries) == 3
+    assert queries[1].startswith("UPDATE")
+
+    assert patch(2, {"un2": "changed"}).status_code == 404
+    assert patch(1, {"uniq": "uniq1"}).status_code == 400
+
+    class OwnerResource(Resource):
+        def get_instance(self, pk, only=None):
+            raise NotFound("Object not found")
+
+    DefaultRouter(app).register("/owner", OwnerResource, "owner")
+
+    # overridden get_instance is used
+    resp = client.patch("/owner/1", data=json.dumps({"un2": "other"}), content_type="application/json")
+    assert resp.status_code == 404
+    assert SAModel.query.get(1).un2 == "changed"
+
+
+@pytest.mark.test_atomic_patch
+def test_patch_with_serializer_update(app, sdb):
+    _add_samodels(1)
+
+    class AtomicSerializer(ModelSerializer):
+        comment = fields.StringField()
+
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "un2")
+
+    class Serializer(AtomicSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "un2")
+
+        def update(self, instance, validated_data):
+            validated_data["un2"] = validated_data["un2"].upper()
+            return super(Serializer, self).update(instance, validated_data)
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAModel.query
+
+    class AtomicResource(Resource):
+        serializer_class = AtomicSerializer
+
+    router = DefaultRouter(app)
+    router.register("/test", Resource, "test")
+    router.register("/atomic", AtomicResource, "atomic")
+    RestFramework(app)
+    client = app.test_client()
+
+    def patch(url, data):
+        resp = client.patch(url, data=json.dumps(data), content_type="application/json")
+        return resp.status_code, json.loads(resp.data.decode("utf-8"))["un2"]
+
+    assert not Resource.is_atomic_update(Resource(None))
+    assert AtomicResource.is_atomic_update(AtomicResource(None))
+
+    # overridden update is called on PATCH
+    assert patch("/test/1", {"un2": "changed"}) == (200, "CHANGED")
+
+    # keys which aren't model columns are skipped by atomic update
+    assert patch("/atomic/1", {"un2": "other", "comment": "text"}) == (200, "other")
+
+
+@pytest.mark.test_old_values_snapshot
+def test_old_values_snapshot(app, sdb):
+    _add_samodels(2)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "un1", "un2")
+
+    calls = []
+
+    class Resource(BulkUpdateMixin, ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAModel.query
+
+        def after_update(self, oldInstance, updatedInstance, validated_data):
+            calls.append((
+                oldInstance.old_values,
+                oldInstance.get_field("un2"), oldInstance.get_field("un1"),
+                updatedInstance.get_field("un2")
+            ))
+            # item of snapshot is detached copy with old values
+            calls.append((oldInstance.item.un2, oldInstance.item.un1, oldInstance.item is updatedInstance.item))
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    app.config["PROPAGATE_EXCEPTIONS"] = True
+    resp = client.patch("/test", data=json.dumps([{"id": 2, "un2": "changed"}]), content_type="application/json")
+    assert resp.status_code == 200
+    assert calls == [({"un2": "un2_1"}, "un2_1", "un1", "changed"), ("un2_1", "un1", False)]
+    assert SAModel.query.get(2).un2 == "changed"
+
+
+@pytest.mark.test_unit_of_work
+def test_unit_of_work(app, sdb):
+    app.config["FLASK_REST"] = {"SQLALCHEMY_POOL": {"pool_recycle": 10}}
+    UnitOfWorkMiddleware.register(app)
+    RestFramework(app)
+    assert app.config["SQLALCHEMY_POOL_RECYCLE"] == 10
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "boolean", "un1", "un2")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAModel.query
+
+        def after_create(self, instance, validated_data):
+            if instance.get_field("un1") == "fail":
+                raise ValidationError("Fail")
+
+            db.session.add(SAAuthor(name=instance.get_field("uniq")))
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    commits = []
+    sa.event.listen(db.engine, "commit", lambda conn: commits.append(1))
+
+    def post(data):
+        return client.post("/test", data=json.dumps(data), content_type="application/json")
+
+    resp = post([dict(uniq="uniq{}".format(i), boolean=True, un1="un1", un2=str(i)) for i in range(2)])
+    assert resp.status_code == 200
+    # created objects and objects added by hooks are committed once
+    assert len(commits) == 1
+    assert SAModel.query.count() == 2
+    assert [a.name for a in SAAuthor.query.order_by(SAAuthor.id)] == ["uniq0", "uniq1"]
+
+    resp = post(dict(uniq="uniq2", boolean=True, un1="fail", un2="2"))
+    assert resp.status_code == 400
+    assert SAModel.query.count() == 2
+
+    resp = client.delete("/test/1")
+    assert resp.status_code == 200
+    assert SAModel.query.count() == 1
+
+
+@pytest.mark.test_unit_of_work
+def test_unit_of_work_commit_failure(app):
+    failed = mock.Mock()
+    failed.commit.side_effect = RuntimeError("commit failed")
+    other = mock.Mock()
+    callback = mock.Mock()
+
+    with app.test_request_context():
+        unit_of_work.begin()
+        unit_of_work.commit(failed)
+        unit_of_work.commit(other)
+        unit_of_work.on_commit(callback)
+
+        with pytest.raises(RuntimeError):
+            unit_of_work.end(commit=True)
+
+        # not committed sessions are rolled back, unit of work is finished
+        assert failed.rollback.called and other.rollback.called
+        assert not other.commit.called
+        assert not callback.called
+        assert not unit_of_work.is_active()
+
+
+@pytest.mark.test_unit_of_work
+def test_unit_of_work_pool_config(app):
+    app.config["FLASK_REST"] = {"SQLALCHEMY_POOL": {"pool_size": 5, "size": 10}}
+
+    with pytest.raises(ValueError) as e:
+        UnitOfWorkMiddleware.register(app)
+    assert "size" in str(e.value) and "pool_size" in str(e.value)
+
+
+@pytest.mark.test_unit_of_work
+def test_cache_invalidated_after_commit(app, sdb):
+    cache = LRUCache()
+    qs = CachedQuerySet(QuerysetWrapper.from_queryset(SAModel.query), cache, ttl=60)
+    model = qs.data.get_model_key()
+
+    with app.test_request_context():
+        unit_of_work.begin()
+        qs.invalidate()
+        generation = get_generation(cache, model)
+
+        unit_of_work.end(commit=False)
+        assert get_generation(cache, model) == generation
+
+        unit_of_work.begin()
+        qs.invalidate()
+        generation = get_generation(cache, model)
+
+        # results read by other requests before commit are cached with this generation
+        unit_of_work.end(commit=True)
+        assert get_generation(cache, model) != generation
+
+
+@pytest.mark.test_delete_one
+def test_delete_one(app, sdb):
+    _add_samodels(3)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+
+    deleted = []
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAModel.query.filter(SAModel.un2 != "un2_2")
+
+    class HookResource(Resource):
+        def before_delete(self, instance):
+            deleted.append(instance.get_field("uniq"))
+
+    class OwnerResource(Resource):
+        def get_instance(self, pk, only=None):
+            # for example permission check
+            raise NotFound("Object not found")
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    DefaultRouter(app).register("/hook", HookResource, "hook")
+    DefaultRouter(app).register("/owner", OwnerResource, "owner")
+    RestFramework(app)
+    client = app.test_client()
+
+    with _count_queries() as queries:
+        resp = client.delete("/test/1")
+    assert json.loads(resp.data.decode("utf-8")) == {"id": "1"}
+    assert len(queries) == 1 and queries[0].startswith("DELETE")
+
+    assert client.delete("/test/1").status_code == 404
+    # record is outside of resource queryset
+    assert client.delete("/test/3").status_code == 404
+
+    # overridden get_instance is used
+    assert client.delete("/owner/2").status_code == 404
+
+    resp = client.delete("/hook/2")
+    assert resp.status_code == 200
+    assert deleted == ["uniq1"]
+    assert [item.id for item in SAModel.query] == [3]
+
+
+@pytest.mark.test_delete_one_with_cascade
+def test_delete_one_with_cascade(app, sdb):
+    post = SAPost(title="post")
+    post.comments = [SAComment(), SAComment()]
+    sdb.session.add(post)
+    sdb.session.add(SAPost(title="other"))
+    sdb.session.commit()
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAPost
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+
+        def get_queryset(self):
+            return SAPost.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    assert client.delete("/test/{}".format(post.id)).status_code == 200
+    assert [item.title for item in SAPost.query] == ["other"]
+    # comments are deleted by relation cascade
+    assert SAComment.query.count() == 0
+
+    assert client.delete("/test/{}".format(post.id)).status_code == 404
+
+
+@pytest.mark.test_delete_one_expunges_instance
+def test_delete_one_expunges_instance(app, sdb):
+    _add_samodels(2)
+
+    with app.test_request_context():
+        instance = SAModel.query.get(1)
+
+        # id from url is a string
+        QuerysetWrapper.from_queryset(SAModel.query).delete_one("1")
+
+        assert instance not in sdb.session
+        assert [item.id for item in SAModel.query] == [2]
+
+
+@pytest.mark.test_chunked_delete_many
+def test_chunked_delete_many(app, sdb):
+    _add_samodels(5)
+    SAModel.query.filter_by(uniq="uniq4").update({"un1": "hidden"})
+    db.session.commit()
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+
+    class Resource(DeleteManyMixin, ModelResource):
+        serializer_class = Serializer
+        delete_chunk_size = 2
+
+        def get_queryset(self):
+            return SAModel.query.filter(SAModel.un1 != "hidden")
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    def delete(data=None):
+        resp = client.delete("/test", data=json.dumps(data), content_type="application/json")
+        return json.loads(resp.data.decode("utf-8"))
+
+    assert delete({"ids": [1, 5]}) == {"deleted": 1, "chunks": 1}
+
+    with _count_queries() as queries:
+        assert delete() == {"deleted": 3, "chunks": 2}
+    assert len([q for q in queries if q.startswith("DELETE")]) == 2
+
+    assert [item.uniq for item in SAModel.query] == ["uniq4"]
+
+    # count of rows is multiple of chunk size
+    _add_samodels(4, start=5)
+    assert delete() == {"deleted": 4, "chunks": 2}
+    assert [item.uniq for item in SAModel.query] == ["uniq4"]
+
+    # rows are inserted concurrently after each chunk, count of chunks is limited
+    _add_samodels(2, start=10)
+    bulk_delete = SqlAlchemyQuerySet.bulk_delete
+    added = []
+
+    def insert_after_delete(qs, ids):
+        count = bulk_delete(qs, ids)
+        added.append(1)
+        _add_samodels(1, start=20 + len(added))
+        return count
+
+    with mock.patch.object(SqlAlchemyQuerySet, "bulk_delete", insert_after_delete):
+        assert delete() == {"deleted": 4, "chunks": 3}
+    assert SAModel.query.count() == 2
+
+
+@pytest.mark.test_export
+def test_export(app, sdb):
+    _add_samodels(3)
+    SAModel.query.filter_by(uniq="uniq2").update({"un1": "a,b"})
+    db.session.commit()
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "un1")
+
+    class Resource(ExportMixin, ModelResource):
+        serializer_class = Serializer
+        filter_backends = [DefaultFilterBackend]
+        export_batch_size = 2
+
+        def get_queryset(self):
+            return SAModel.query.order_by(SAModel.id)
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    resp = client.get("/test/export")
+    assert resp.mimetype == "application/x-ndjson"
+    assert [json.loads(line) for line in resp.data.decode("utf-8").splitlines()] == [
+        {"id": 1, "uniq": "uniq0", "un1": "un1"},
+        {"id": 2, "uniq": "uniq1", "un1": "un1"},
+        {"id": 3, "uniq": "uniq2", "un1": "a,b"},
+    ]
+
+    resp = client.get("/test/export?_format=csv&uniq=uniq2")
+    assert resp.mimetype == "text/csv"
+    lines = resp.data.decode("utf-8").splitlines()
+    assert sorted(lines[0].split(",")) == ["id", "un1", "uniq"]
+    assert len(lines) == 2 and '"a,b"' in lines[1]
+
+    # not ascii values
+    SAModel.query.filter_by(uniq="uniq1").update({"un1": u"\u0437\u043d\u0430\u0447\u0435\u043d\u0438\u0435"})
+    db.session.commit()
+    resp = client.get("/test/export?_format=csv&uniq=uniq1")
+    assert u"\u0437\u043d\u0430\u0447\u0435\u043d\u0438\u0435" in resp.data.decode("utf-8").splitlines()[1]
+
+    assert client.get("/test/export?_format=xml").status_code == 400
+
+
+@pytest.mark.test_import
+def test_import(app, sdb):
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "boolean", "un1", "un2")
+
+    class Resource(ImportMixin, ModelResource):
+        serializer_class = Serializer
+        import_batch_size = 2
+
+        def get_queryset(self):
+            return SAModel.query
+
+        def after_create(self, instance, validated_data):
+            if instance.get_field("un1") == "fail":
+                raise ValueError("Fail")
+
+    UnitOfWorkMiddleware.register(app)
+    DefaultRouter(app).register("/test", Resource, "test")
+    client = app.test_client()
+
+    def post(lines):
+        resp = client.post("/test/import", data="\n".join(lines), content_type="application/x-ndjson")
+        assert resp.mimetype == "application/x-ndjson"
+        assert resp.is_streamed
+        return [json.loads(line) for line in resp.data.decode("utf-8").splitlines()]
+
+    assert post([
+        json.dumps(dict(uniq="uniq0", boolean=True, un1="un1", un2="0")),
+        "not json",
+        "",
+        json.dumps(dict(uniq="uniq1", boolean=True, un1="un1", un2="1")),
+        json.dumps(dict(uniq="uniq2", un1="un1", un2="2")),
+        json.dumps(dict(uniq="uniq3", boolean=False, un1="un1", un2="3")),
+    ]) == [
+        {"line": 2, "errors": {"_line": ["JSON object expected"]}},
+        {"batch": 1, "lines": [1, 2], "created": 1},
+        {"line": 5, "errors": {"boolean": ["Field is required"]}},
+        {"batch": 2, "lines": [4, 5], "created": 1},
+        {"batch": 3, "lines": [6, 6], "created": 1},
+        {"created": 3, "failed": 2, "batches": 3, "complete": True},
+    ]
+    assert [item.uniq for item in SAModel.query.order_by(SAModel.id)] == ["uniq0", "uniq1", "uniq3"]
+
+    # failed batch is rolled back and import stops, committed batches are reported
+    assert post([
+        json.dumps(dict(uniq="uniq4", boolean=True, un1="un1", un2="4")),
+        json.dumps(dict(uniq="uniq5", boolean=True, un1="un1", un2="5")),
+        json.dumps(dict(uniq="uniq6", boolean=True, un1="un1", un2="6")),
+        json.dumps(dict(uniq="uniq7", boolean=True, un1="fail", un2="7")),
+        json.dumps(dict(uniq="uniq8", boolean=True, un1="un1", un2="8")),
+    ]) == [
+        {"batch": 1, "lines": [1, 2], "created": 2},
+        {"batch": 2, "lines": [3, 4], "error": "Fail"},
+        {"created": 2, "failed": 0, "batches": 1, "complete": False},
+    ]
+    assert [item.uniq for item in SAModel.query.order_by(SAModel.id)] == [
+        "uniq0", "uniq1", "uniq3", "uniq4", "uniq5"
+    ]
+
+
+@pytest.mark.test_multi_get
+def test_multi_get(app, sdb):
+    _add_samodels(3)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        bulk_max_size = 3
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    with _count_queries() as queries:
+        resp = client.get("/test?_ids=3,1,9")
+    assert len(queries) == 1
+    assert json.loads(resp.data.decode("utf-8")) == {
+        "results": [{"id": 3, "uniq": "uniq2"}, {"id": 1, "uniq": "uniq0"}, None],
+        "missing": ["9"],
+    }
+
+    def batch_get(data):
+        return client.post("/test/batch_get", data=json.dumps(data), content_type="application/json")
+
+    resp = batch_get({"ids": [2, 42]})
+    assert json.loads(resp.data.decode("utf-8")) == {
+        "results": [{"id": 2, "uniq": "uniq1"}, None],
+        "missing": [42],
+    }
+
+    assert batch_get({"ids": [1, 2, 3, 4]}).status_code == 400
+    assert batch_get({}).status_code == 400
+
+
+@pytest.mark.test_query_cache
+def test_query_cache(app, sdb):
+    _add_samodels(2)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        filter_backends = [DefaultFilterBackend]
+        query_cache_ttl = 60
+        query_cache = LRUCache()
+
+        def get_queryset(self):
+            return SAModel.query.order_by(SAModel.id)
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    def get(url="/test"):
+        return json.loads(client.get(url).data.decode("utf-8"))
+
+    assert get() == [{"id": 1, "uniq": "uniq0"}, {"id": 2, "uniq": "uniq1"}]
+
+    with _count_queries() as queries:
+        assert get() == [{"id": 1, "uniq": "uniq0"}, {"id": 2, "uniq": "uniq1"}]
+        assert get("/test?uniq=uniq1") == [{"id": 2, "uniq": "uniq1"}]
+    # filtered queryset has its own key
+    assert len(queries) == 1
+
+    client.patch("/test/1", data=json.dumps({"uniq": "changed"}), content_type="application/json")
+    assert get() == [{"id": 1, "uniq": "changed"}, {"id": 2, "uniq": "uniq1"}]
+
+    client.delete("/test/2")
+    assert get() == [{"id": 1, "uniq": "changed"}]
+
+
+@pytest.mark.test_query_cache
+def test_query_cache_merges_instances(sdb):
+    db.session.add(SABook(title="book", author=SAAuthor(name="author")))
+    db.session.commit()
+
+    qs = CachedQuerySet(QuerysetWrapper.from_queryset(SABook.query), LRUCache(), 60)
+    list(qs.get_data())
+    db.session.remove()
+
+    with _count_queries() as queries:
+        book, = list(qs.get_data())
+    assert len(queries) == 0
+
+    # lazy relation is loaded in the current session
+    assert book.get_field("author__name") == "author"
+
+
+@pytest.mark.test_detail_cache
+def test_detail_cache(app, sdb):
+    _add_samodels(2)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq", "boolean", "un1", "un2")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        detail_cache_ttl = 60
+
+        def get_queryset(self):
+            return SAModel.query
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    def get(url):
+        resp = client.get(url)
+        data = json.loads(resp.data.decode("utf-8"))
+        if isinstance(data, dict):
+            data = dict((key, data[key]) for key in ("id", "uniq"))
+        return resp.status_code, data
+
+    assert get("/test/1") == (200, {"id": 1, "uniq": "uniq0"})
+    assert get("/test/3")[0] == 404
+
+    with _count_queries() as queries:
+        assert get("/test/1") == (200, {"id": 1, "uniq": "uniq0"})
+        assert get("/test/3")[0] == 404
+    assert len(queries) == 0
+
+    client.patch("/test/1", data=json.dumps({"uniq": "changed"}), content_type="application/json")
+    assert get("/test/1") == (200, {"id": 1, "uniq": "changed"})
+
+    # cached 404 is invalidated by create
+    resp = client.post("/test", data=json.dumps({
+        "uniq": "new", "boolean": True, "un1": "new", "un2": "new",
+    }), content_type="application/json")
+    assert resp.status_code == 200
+    assert get("/test/3") == (200, {"id": 3, "uniq": "new"})
+
+    client.delete("/test/1")
+    assert get("/test/1")[0] == 404
+
+
+@pytest.mark.test_conditional_get
+def test_conditional_get(app, sdb):
+    db.session.add(SAAuthor(name="author"))
+    db.session.commit()
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAAuthor
+            fields = ("id", "name")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        etag_field = "updated"
+
+        def get_queryset(self):
+            return SAAuthor.query
+
+    class BodyEtagResource(Resource):
+        etag_field = None
+        use_etag = True
+
+    router = DefaultRouter(app)
+    router.register("/test", Resource, "test")
+    router.register("/body", BodyEtagResource, "body")
+    RestFramework(app)
+    client = app.test_client()
+
+    for url in ["/test", "/test/1", "/body", "/body/1"]:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        etag = resp.headers["ETag"]
+
+        with _count_queries() as queries:
+            resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+        if url == "/test/1":
+            # only version is loaded
+            assert len(queries) == 1
+
+        client.patch("/test/1", data=json.dumps({"name": url}), content_type="application/json")
+        resp = client.get(url, headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+    resp = client.get("/test/1")
+    resp = client.get("/test/1", headers={"If-Modified-Since": resp.headers["Last-Modified"]})
+    assert resp.status_code == 304
+
+    # list ETag is changed when objects are added
+    etag = client.get("/test").headers["ETag"]
+    db.session.add(SAAuthor(name="other"))
+    db.session.commit()
+    assert client.get("/test", headers={"If-None-Match": etag}).status_code == 200
+
+    # and when objects are replaced without changing of count and max version
+    first, second = SAAuthor.query.order_by(SAAuthor.id)
+    etag = client.get("/test").headers["ETag"]
+    db.session.delete(first)
+    db.session.add(SAAuthor(name="replaced", updated=first.updated))
+    db.session.commit()
+    assert client.get("/test", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.test_response_cache
+def test_response_cache(app, sdb):
+    _add_samodels(2)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        filter_backends = [DefaultFilterBackend]
+        response_cache_ttl = 60
+        response_cache_vary_headers = ["X-User"]
+        response_cache_vary_args = ["uniq"]
+
+        def get_queryset(self):
+            return SAModel.query.order_by(SAModel.id)
+
+    app.config["FLASK_REST"] = {"RESPONSE_CACHE": LRUCache()}
+    ResponseCacheMiddleware.register(app)
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    def get(url, **kwargs):
+        return json.loads(client.get(url, **kwargs).data.decode("utf-8"))
+
+    assert get("/test") == [{"id": 1, "uniq": "uniq0"}, {"id": 2, "uniq": "uniq1"}]
+    assert get("/test/1") == {"id": 1, "uniq": "uniq0"}
+
+    with _count_queries() as queries:
+        assert get("/test") == [{"id": 1, "uniq": "uniq0"}, {"id": 2, "uniq": "uniq1"}]
+        # not vary args are ignored
+        assert get("/test?other=1") == [{"id": 1, "uniq": "uniq0"}, {"id": 2, "uniq": "uniq1"}]
+        assert get("/test/1") == {"id": 1, "uniq": "uniq0"}
+    assert len(queries) == 0
+
+    with _count_queries() as queries:
+        assert get("/test?uniq=uniq1") == [{"id": 2, "uniq": "uniq1"}]
+        assert get("/test/1", headers={"X-User": "other"}) == {"id": 1, "uniq": "uniq0"}
+    assert len(queries) == 2
+
+    client.patch("/test/1", data=json.dumps({"uniq": "changed"}), content_type="application/json")
+    assert get("/test") == [{"id": 1, "uniq": "changed"}, {"id": 2, "uniq": "uniq1"}]
+    assert get("/test/1") == {"id": 1, "uniq": "changed"}
+
+    class DefaultVaryResource(Resource):
+        response_cache_vary_headers = BaseResource.response_cache_vary_headers
+
+    DefaultRouter(app).register("/default", DefaultVaryResource, "default")
+
+    # by default responses of one user aren't returned to another
+    with _count_queries() as queries:
+        get("/default/1", headers={"Authorization": "Token user1"})
+        get("/default/1", headers={"Authorization": "Token user1"})
+        get("/default/1", headers={"Authorization": "Token user2"})
+        get("/default/1", headers={"Cookie": "session=user3"})
+    assert len(queries) == 3
+
+
+@pytest.mark.test_response_cache
+def test_response_cache_authentication(app, sdb):
+    _add_samodels(1)
+
+    class TokenAuth(BaseAuthenticationBackend):
+        def get_user(self, request):
+            return request.headers.get("X-Token") == "secret"
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        authentication_backends = [TokenAuth]
+        response_cache_ttl = 60
+        response_cache_vary_headers = []
+
+        def get_queryset(self):
+            return SAModel.query
+
+    app.config["FLASK_REST"] = {"RESPONSE_CACHE": LRUCache()}
+    # cache middleware is registered before authentication
+    ResponseCacheMiddleware.register(app)
+    AuthenticationMiddleware.register(app)
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    assert client.get("/test/1", headers={"X-Token": "secret"}).status_code == 200
+
+    with _count_queries() as queries:
+        assert client.get("/test/1", headers={"X-Token": "secret"}).status_code == 200
+        # cached response isn't returned to not authenticated request
+        assert client.get("/test/1").status_code == 401
+        assert client.get("/test/1", headers={"X-Token": "wrong"}).status_code == 401
+    assert len(queries) == 0
+
+
+@pytest.mark.test_coalesce_requests
+def test_coalesce_requests(app, sdb):
+    _add_samodels(2)
+
+    class Serializer(ModelSerializer):
+        class Meta:
+            model = SAModel
+            fields = ("id", "uniq")
+
+    calls = []
+
+    class Resource(ModelResource):
+        serializer_class = Serializer
+        coalesce_requests = True
+
+        def get_queryset(self):
+            return SAModel.query.order_by(SAModel.id)
+
+        def _get_list(self, request):
+            calls.append(request.args.get("page"))
+            time.sleep(0.2)
+            return super(Resource, self)._get_list(request)
+
+    DefaultRouter(app).register("/test", Resource, "test")
+    RestFramework(app)
+    client = app.test_client()
+
+    results = []
+
+    def get(url):
+        with app.app_context():
+            resp = client.get(url)
+            results.append((url, resp.status_code, json.loads(resp.data.decode("utf-8"))))
+
+    threads = [threading.Thread(target=get, args=(url, )) for url in ["/test"] * 3 + ["/test?page=1"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # identical requests are coalesced, requests with other args aren't
+    assert len(calls) == 2
+    assert set(calls) == set([None, "1"])
+    assert len(results) == 4
+    for url, status, data in results:
+        assert status == 200
+        assert data == [{"id": 1, "uniq": "uniq0"}, {"id": 2, "uniq": "uniq1"}]
+
+    # requests to one endpoint with different url params aren't coalesced
+    app.add_url_rule("/tenants/<tenant>/test", "tenant_test", lambda tenant: "")
+
+    def get_key(url):
+        with app.test_request_context(url):
+            return Resource(request)._get_coalesce_key(request)
+
+    assert get_key("/tenants/a/test") != get_key("/tenants/b/test")
+    assert get_key("/tenants/a/test") == get_key("/tenants/a/test")
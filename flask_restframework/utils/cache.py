@@ -0,0 +1,218 @@
+"""
+Simple in-process caches used by framework internals.
+
+All caches implement :class:`BaseCache` interface, so external store (redis, memcached, ...)
+can be plugged in by implementing it.
+"""
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import OrderedDict
+
+from mongoengine.base.document import BaseDocument
+
+
+class BaseCache(object):
+    """
+    Cache backend interface.
+    """
+
+    def get(self, key, default=None):
+        "Should return value for key or default if it is absent or expired"
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        "Should store value for ttl seconds (forever if ttl is None)"
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class TTLCache(BaseCache):
+    """
+    Thread safe in-process cache with time to live for entries.
+    When max_size is exceeded, the oldest entry is evicted.
+
+    Usage example::
+
+        >>> cache = TTLCache(max_size=100)
+        >>> cache.set("key", 1, ttl=60)
+        >>> cache.get("key")
+        1
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._data = OrderedDict()  #key: (expires at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        "Returns value for key or default if it is absent or expired"
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires < time.time():
+                del self._data[key]
+                return default
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        "Stores value for ttl seconds"
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (_expires_at(ttl), value)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class LRUCache(BaseCache):
+    """
+    Thread safe in-process LRU cache with time to live for entries and memory budget.
+    Least recently used entries are evicted when there are more than max_size entries
+    or their estimated size is more than max_bytes.
+
+    Usage example::
+
+        >>> cache = LRUCache(max_size=1000, max_bytes=64 * 1024 * 1024)
+        >>> cache.set("key", [1, 2], ttl=60)
+        >>> cache.get("key")
+        [1, 2]
+    """
+
+    def __init__(self, max_size=1000, max_bytes=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.size = 0   #estimated size of all entries in bytes
+        self._data = OrderedDict()  #key: (expires at, size, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, size, value = self._data[key]
+            except KeyError:
+                return default
+
+            if expires < time.time():
+                self._pop(key)
+                return default
+
+            # move to the end as recently used
+            del self._data[key]
+            self._data[key] = (expires, size, value)
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = estimate_size(value)
+
+        with self._lock:
+            self._pop(key)
+
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._data[key] = (_expires_at(ttl), size, value)
+            self.size += size
+
+            while len(self._data) > self.max_size or (
+                self.max_bytes is not None and self.size > self.max_bytes
+            ):
+                oldest, (_, oldest_size, _) = self._data.popitem(last=False)
+                self.size -= oldest_size
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+
+def _expires_at(ttl):
+    if ttl is None:
+        return float("inf")
+    return time.time() + ttl
+
+
+#max nesting level counted by estimate_size
+_MAX_SIZE_DEPTH = 8
+
+
+def estimate_size(value, _seen=None, _depth=0):
+    """
+    Returns approximate size of value in bytes.
+    Containers and attributes of objects are counted recursively, ORM internals
+    (SQLAlchemy instance state) are skipped. Field values of mongoengine documents
+    are stored in slots, so they are counted by document _data.
+    """
+    if _seen is None:
+        _seen = set()
+
+    if id(value) in _seen or _depth > _MAX_SIZE_DEPTH:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        for key, item in list(value.items()):
+            size += estimate_size(key, _seen, _depth + 1) + estimate_size(item, _seen, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _seen, _depth + 1)
+    elif isinstance(value, BaseDocument):
+        size += estimate_size(value._data, _seen, _depth + 1)
+    elif hasattr(value, "__dict__") and not isinstance(value, (type, types.ModuleType, types.FunctionType)):
+        for key, item in list(vars(value).items()):
+            if not key.startswith("_sa_"):
+                size += estimate_size(item, _seen, _depth + 1)
+
+    return size
+
+def get_generation(cache, name):
+    """
+    Returns current generation token of name (for example model) in cache.
+    Generation should be a part of cache keys, so all entries of name are invalidated
+    by :func:`bump_generation`. If token is evicted from cache, new one is created,
+    so stale entries are never served.
+    """
+    key = "generation:{}".format(name)
+    generation = cache.get(key)
+
+    if generation is None:
+        generation = uuid.uuid4().hex
+        cache.set(key, generation)
+
+    return generation
+
+
+def bump_generation(cache, name):
+    "Invalidates all cache entries of name which use its generation in keys"
+    cache.set("generation:{}".format(name), uuid.uuid4().hex)
@@ -0,0 +1,64 @@
+"""
+Coalescing of identical concurrent calls (singleflight).
+
+If function is called with key which is already in flight in other thread,
+caller waits for and shares result of that call instead of calling function again.
+"""
+import sys
+import threading
+
+import six
+
+
+class _Call(object):
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None   #exc_info of failed call
+
+
+class SingleFlight(object):
+    """
+    Thread safe coalescing of calls by key.
+
+    Usage example::
+
+        >>> flight = SingleFlight()
+        >>> flight.do("key", lambda: expensive_query())
+
+    Concurrent callers with the same key get the same result object (or the same exception),
+    so it should not be mutated by them.
+    """
+
+    def __init__(self):
+        self._calls = {}    #key: _Call
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        "Calls func or waits for result of call with the same key which is already in flight"
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+
+            if call.error is not None:
+                six.reraise(*call.error)
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException:
+            call.error = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result
@@ -0,0 +1,97 @@
+"""
+Request scoped unit of work for SQLAlchemy sessions.
+
+By default SQLAlchemy wrappers commit session after each change. When unit of work is
+started for request (see :class:`flask_restframework.middlewares.UnitOfWorkMiddleware`),
+wrappers only register sessions here (and flush them if generated values like ids are needed)
+and all changes of request are committed once when request ends.
+Code which should run only after changes are committed (for example cache invalidation)
+is registered with :func:`on_commit`.
+"""
+from flask import g, has_app_context
+
+_SESSIONS_KEY = "_rest_unit_of_work_sessions"
+_CALLBACKS_KEY = "_rest_unit_of_work_callbacks"
+
+
+def _get_sessions():
+    if not has_app_context():
+        return None
+
+    return getattr(g, _SESSIONS_KEY, None)
+
+
+def begin():
+    "Starts unit of work for current request"
+    setattr(g, _SESSIONS_KEY, [])
+    setattr(g, _CALLBACKS_KEY, [])
+
+
+def is_active():
+    "Returns True if unit of work is started for current request"
+    return _get_sessions() is not None
+
+
+def commit(session, flush=False):
+    """
+    Commits session, or registers it for commit at the end of request if unit of work is active.
+
+    :param flush: flush session if commit is deferred, it is needed for getting generated values (ids)
+    """
+    sessions = _get_sessions()
+
+    if sessions is None:
+        session.commit()
+        return
+
+    if flush:
+        session.flush()
+
+    if not any(item is session for item in sessions):
+        sessions.append(session)
+
+
+def on_commit(callback):
+    """
+    Registers callback which is called after all changes of current request are committed.
+    If unit of work isn't active, changes are already committed and callback is called at once.
+    Callbacks aren't called if changes are rolled back.
+    """
+    if not is_active():
+        callback()
+        return
+
+    getattr(g, _CALLBACKS_KEY).append(callback)
+
+
+def end(commit=True):
+    """
+    Finishes unit of work: commits (or rollbacks if commit=False) all registered sessions.
+    If commit of some session fails, it and not committed sessions are rolled back and error is raised.
+    Callbacks registered by on_commit are called after successful commit.
+    """
+    sessions = _get_sessions()
+    if sessions is None:
+        return
+
+    callbacks = getattr(g, _CALLBACKS_KEY, None) or []
+
+    try:
+        if not commit:
+            for session in sessions:
+                session.rollback()
+            return
+
+        for index, session in enumerate(sessions):
+            try:
+                session.commit()
+            except Exception:
+                for other in sessions[index:]:
+                    other.rollback()
+                raise
+    finally:
+        setattr(g, _SESSIONS_KEY, None)
+        setattr(g, _CALLBACKS_KEY, None)
+
+    for callback in callbacks:
+        callback()
@@ -2,6 +2,9 @@ import contextlib
 import warnings
 
 import functools
+
+import six
+from flask import json
 from mongoengine.errors import FieldDoesNotExist, ValidationError
 
 from flask_restframework import exceptions
@@ -29,4 +32,55 @@ def deprecated(func):
         warnings.simplefilter('default', DeprecationWarning) #reset filter
         return func(*args, **kwargs)
 
-    return new_func
\ No newline at end of file
+    return new_func
+
+
+def is_method_overridden(instance, baseCls, name):
+    "Returns True if method name of baseCls is overridden in class of instance (or in instance if it is class)"
+    cls = instance if isinstance(instance, type) else instance.__class__
+    return six.get_unbound_function(getattr(cls, name)) is not \
+           six.get_unbound_function(getattr(baseCls, name))
+
+
+def iter_json_array(items, wrap=None):
+    """
+    Generator which encodes items as JSON array chunk by chunk.
+
+    :param items: iterable of json-compatible objects
+    :param wrap: optional callable (items)->dict, which places items into response envelope,
+        for example :meth:`flask_restframework.pagination.DefaultPagination.update_response`.
+        Envelope value which is iterator is streamed as array, others are encoded as is.
+    """
+    head, tail = "", ""
+
+    items = iter(items)
+
+    if wrap:
+        envelope = wrap(items)
+
+        parts = []
+        for key, value in envelope.items():
+            if _is_iterator(value):
+                head = json.dumps(key) + ": "
+                items = value
+            else:
+                parts.append("{}: {}".format(json.dumps(key), json.dumps(value)))
+
+        head = "{" + "".join(part + ", " for part in parts) + head
+        tail = "}"
+
+    yield head + "["
+
+    first = True
+    for item in items:
+        if first:
+            first = False
+            yield json.dumps(item)
+        else:
+            yield "," + json.dumps(item)
+
+    yield "]" + tail
+
+
+def _is_iterator(value):
+    return hasattr(value, "__next__") or hasattr(value, "next")